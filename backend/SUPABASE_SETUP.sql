@@ -21,6 +21,11 @@ CREATE INDEX IF NOT EXISTS idx_ingredients_eng_name ON ingredients(eng_name);
 CREATE INDEX IF NOT EXISTS idx_ingredients_good_for ON ingredients USING GIN(good_for);
 CREATE INDEX IF NOT EXISTS idx_ingredients_bad_for ON ingredients USING GIN(bad_for);
 
+-- ILIKE 부분 매칭용 trigram 인덱스 (ILIKE '%...%'는 B-tree 인덱스를 사용할 수 없음)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_ingredients_kor_name_trgm ON ingredients USING GIN(kor_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_ingredients_eng_name_trgm ON ingredients USING GIN(eng_name gin_trgm_ops);
+
 -- 3. 업데이트 시간 자동 갱신 함수
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
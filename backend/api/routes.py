@@ -4,7 +4,10 @@ API 엔드포인트 정의
 """
 
 import logging
+import orjson
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 
 import sys
 import os
@@ -16,8 +19,6 @@ from api.models import (
     AnalyzeProductRequest,
     AnalyzeProductResponse,
     HealthResponse,
-    GoodMatch,
-    BadMatch,
     GeminiPurposeRequest,
     GeminiPurposeResponse,
     GeminiTranslateRequest,
@@ -33,7 +34,7 @@ from api.models import (
     GeminiEnhanceRequest,
     GeminiEnhanceResponse,
 )
-from supabase_client import get_all_ingredients, test_supabase_connection
+from supabase_client import test_supabase_connection
 from llm.gemini_service import GeminiService
 
 logger = logging.getLogger(__name__)
@@ -51,6 +52,15 @@ def setup_routes(app, rag_system):
     # Gemini 서비스 초기화
     gemini_service = GeminiService()
     
+    # 성분 목록 응답은 초기화 후 변하지 않으므로 한 번만 직렬화하여 재사용
+    ingredient_names = rag_system.data_loader.get_display_names()
+    ingredients_response_bytes = orjson.dumps({
+        'ingredients': ingredient_names,
+        'count': len(ingredient_names),
+        'database': rag_system.get_data_source(),
+        'success': True
+    })
+    
     @app.get("/", tags=["Root"])
     async def root():
         """
@@ -68,30 +78,48 @@ def setup_routes(app, rag_system):
             "docs": "/docs"
         }
     
-    @app.get("/health", response_model=HealthResponse, tags=["Health"])
+    # 헬스 체크 응답도 초기화 후 변하지 않으므로 미리 직렬화 (로드밸런서 프로브 경로)
+    health_response_bytes = orjson.dumps({
+        "status": "healthy",
+        "message": "RAG 서버 정상 작동 중",
+        "ingredients_count": rag_system.get_ingredients_count(),
+        "database": rag_system.get_data_source(),
+        "features": [
+            "Supabase PostgreSQL" if rag_system.use_supabase else "JSON Fallback",
+            "ChromaDB Vector Store",
+            "LangChain RAG Pipeline",
+            "FastAPI Async"
+        ]
+    })
+    
+    @app.get(
+        "/health",
+        response_model=None,
+        response_class=ORJSONResponse,
+        responses={200: {"model": HealthResponse}},
+        tags=["Health"]
+    )
     async def health_check():
         """
         서버 상태 확인 엔드포인트
         
         서버가 정상 작동 중인지 확인하고 현재 상태 정보를 반환합니다.
+        응답은 서버 시작 시 미리 직렬화된 바이트를 그대로 사용합니다.
         
         Returns:
-            HealthResponse: 서버 상태 정보
+            HealthResponse 형식의 서버 상태 JSON 응답
         """
-        return HealthResponse(
-            status="healthy",
-            message="RAG 서버 정상 작동 중",
-            ingredients_count=rag_system.get_ingredients_count(),
-            database=rag_system.get_data_source(),
-            features=[
-                "Supabase PostgreSQL" if rag_system.use_supabase else "JSON Fallback",
-                "ChromaDB Vector Store",
-                "LangChain RAG Pipeline",
-                "FastAPI Async"
-            ]
-        )
+        return Response(content=health_response_bytes, media_type="application/json")
     
-    @app.post("/search", response_model=SearchResponse, tags=["Search"])
+    # 응답 데이터는 서버가 직접 생성한 값이므로 Pydantic 재검증 없이 그대로 직렬화
+    # (responses의 모델은 API 문서용으로만 사용)
+    @app.post(
+        "/search",
+        response_model=None,
+        response_class=ORJSONResponse,
+        responses={200: {"model": SearchResponse}},
+        tags=["Search"]
+    )
     async def search_ingredients(request: SearchRequest):
         """
         성분 검색 엔드포인트
@@ -102,7 +130,7 @@ def setup_routes(app, rag_system):
             request: 검색 요청 (SearchRequest)
         
         Returns:
-            SearchResponse: 검색 결과
+            SearchResponse 형식의 검색 결과 JSON 응답
         
         Raises:
             HTTPException: 검색어가 비어있을 경우 400 에러
@@ -110,10 +138,19 @@ def setup_routes(app, rag_system):
         if not request.query:
             raise HTTPException(status_code=400, detail="검색어를 입력해주세요")
         
-        result = rag_system.search_ingredients(request.query, request.session_id)
-        return SearchResponse(**result)
+        # 벡터 검색/DB 조회는 동기 호출이므로 스레드풀에서 실행 (이벤트 루프 블로킹 방지)
+        result = await run_in_threadpool(
+            rag_system.search_ingredients, request.query, request.session_id
+        )
+        return ORJSONResponse(result)
     
-    @app.post("/analyze_product", response_model=AnalyzeProductResponse, tags=["Analysis"])
+    @app.post(
+        "/analyze_product",
+        response_model=None,
+        response_class=ORJSONResponse,
+        responses={200: {"model": AnalyzeProductResponse}},
+        tags=["Analysis"]
+    )
     async def analyze_product(request: AnalyzeProductRequest):
         """
         제품 성분 분석 엔드포인트
@@ -124,7 +161,7 @@ def setup_routes(app, rag_system):
             request: 분석 요청 (AnalyzeProductRequest)
         
         Returns:
-            AnalyzeProductResponse: 분석 결과
+            AnalyzeProductResponse 형식의 분석 결과 JSON 응답
         
         Raises:
             HTTPException: 성분 리스트가 비어있을 경우 400 에러
@@ -132,50 +169,34 @@ def setup_routes(app, rag_system):
         if not request.ingredients:
             raise HTTPException(status_code=400, detail="성분 리스트가 필요합니다")
         
-        result = rag_system.analyze_product_ingredients(request.ingredients, request.skin_type)
-        
-        good_matches = [GoodMatch(**m) for m in result["good_matches"]]
-        bad_matches = [BadMatch(**m) for m in result["bad_matches"]]
-        
-        return AnalyzeProductResponse(
-            analysis_report=result["analysis_report"],
-            good_matches=good_matches,
-            bad_matches=bad_matches,
-            success=result["success"]
+        # 성분 조회 및 리포트 생성은 동기 호출이므로 스레드풀에서 실행
+        result = await run_in_threadpool(
+            rag_system.analyze_product_ingredients, request.ingredients, request.skin_type
         )
+        return ORJSONResponse(result)
     
-    @app.get("/ingredients", tags=["Ingredients"])
+    @app.get("/ingredients", response_class=ORJSONResponse, tags=["Ingredients"])
     async def get_all_ingredients_api():
         """
         모든 성분 목록을 반환하는 엔드포인트
         
         데이터베이스에 저장된 모든 성분의 이름을 반환합니다.
+        응답은 서버 시작 시 미리 직렬화된 바이트를 그대로 사용합니다.
         
         Returns:
-            성분 목록 딕셔너리
+            성분 목록 JSON 응답
         """
-        if rag_system.use_supabase:
-            ingredients = get_all_ingredients()
-        else:
-            ingredients = rag_system.data_loader.ingredients_data
-        
-        result = []
-        for item in ingredients:
-            kor = item.get('kor_name', '')
-            eng = item.get('eng_name', '')
-            if kor and eng:
-                result.append(f"{kor} ({eng})")
-            elif kor:
-                result.append(kor)
-            elif eng:
-                result.append(eng)
+        return Response(content=ingredients_response_bytes, media_type="application/json")
+    
+    @app.get("/cache/stats", tags=["Cache"])
+    async def cache_stats():
+        """
+        검색 캐시 통계 엔드포인트
         
-        return {
-            'ingredients': result,
-            'count': len(result),
-            'database': rag_system.get_data_source(),
-            'success': True
-        }
+        Returns:
+            검색 결과 캐시의 항목 수, 적중/미스 횟수, 적중률
+        """
+        return rag_system.get_cache_stats()
     
     @app.get("/database/status", tags=["Database"])
     async def database_status():
@@ -8,6 +8,22 @@ from typing import List, Optional, Any
 from langchain_core.language_models.llms import LLM
 from langchain_core.callbacks.manager import CallbackManagerForLLMRun
 
+# 프롬프트 파싱 패턴 (호출마다 컴파일하지 않도록 모듈 로드 시 한 번만 컴파일)
+_RE_SKIN = re.compile(r'사용자 피부 타입:\s*([^\n]+)')
+_RE_GOOD_FOR_TYPE = re.compile(r'\[.*?\]에 좋은 성분 목록:\s*([^\n]+)')
+_RE_GOOD = re.compile(r'좋은 성분 목록:\s*([^\n]+)')
+_RE_BAD_GENERAL = re.compile(r'주의 성분 목록 \(일반적 포함\):\s*([^\n]+)')
+_RE_BAD = re.compile(r'주의 성분 목록:\s*([^\n]+)')
+_RE_PURPOSE = re.compile(r'주요 성분 목적\):\s*([^\n]+)')
+_RE_FIRST_PURPOSE = re.compile(r'([a-zA-Z가-힣\s]+)\s*\(\d+회\)')
+
+# 성분 목적 → 제품 타입 매핑
+_PURPOSE_MAP = {
+    "moisturizer": "보습", "antioxidant": "항산화",
+    "exfoliant": "각질 제거", "fragrance": "향료",
+    "preservative": "보존", "emulsifier": "유화"
+}
+
 
 class MockLLM(LLM):
     """
@@ -81,21 +97,21 @@ class MockLLM(LLM):
             생성된 분석 리포트 (한국어)
         """
         # 피부 타입 추출
-        skin_type_match = re.search(r'사용자 피부 타입:\s*([^\n]+)', prompt)
+        skin_type_match = _RE_SKIN.search(prompt)
         skin_type = skin_type_match.group(1).strip() if skin_type_match else "알 수 없는"
         
         # 좋은 성분 목록 추출
-        good_match_str = re.search(r'\[.*?\]에 좋은 성분 목록:\s*([^\n]+)', prompt)
+        good_match_str = _RE_GOOD_FOR_TYPE.search(prompt)
         if not good_match_str:
-            good_match_str = re.search(r'좋은 성분 목록:\s*([^\n]+)', prompt)
+            good_match_str = _RE_GOOD.search(prompt)
         good_names = good_match_str.group(1).strip() if good_match_str else ""
         if good_names == "없음":
             good_names = ""
         
         # 주의 성분 목록 추출
-        bad_match_str = re.search(r'주의 성분 목록 \(일반적 포함\):\s*([^\n]+)', prompt)
+        bad_match_str = _RE_BAD_GENERAL.search(prompt)
         if not bad_match_str:
-            bad_match_str = re.search(r'주의 성분 목록:\s*([^\n]+)', prompt)
+            bad_match_str = _RE_BAD.search(prompt)
         bad_names = bad_match_str.group(1).strip() if bad_match_str else ""
         if bad_names == "없음":
             bad_names = ""
@@ -104,20 +120,15 @@ class MockLLM(LLM):
         report_parts = []
         
         # 제품 타입 추론
-        purpose_match = re.search(r'주요 성분 목적\):\s*([^\n]+)', prompt)
+        purpose_match = _RE_PURPOSE.search(prompt)
         main_purpose = "복합적인"
         
         if purpose_match:
             purposes = purpose_match.group(1).strip()
-            purpose_map = {
-                "moisturizer": "보습", "antioxidant": "항산화",
-                "exfoliant": "각질 제거", "fragrance": "향료",
-                "preservative": "보존", "emulsifier": "유화"
-            }
-            first_purpose_match = re.search(r'([a-zA-Z가-힣\s]+)\s*\(\d+회\)', purposes)
+            first_purpose_match = _RE_FIRST_PURPOSE.search(purposes)
             if first_purpose_match:
                 purpose_name = first_purpose_match.group(1).strip().lower()
-                main_purpose = purpose_map.get(purpose_name, purpose_name)
+                main_purpose = _PURPOSE_MAP.get(purpose_name, purpose_name)
         
         report_parts.append(f"이 화장품은(는) '{main_purpose}'에 중점을 둔 제품으로 보입니다.")
         
@@ -4,9 +4,9 @@ ingredients.json → Supabase PostgreSQL 마이그레이션 스크립트
 사용법: python migrate_to_supabase.py
 """
 
-import json
 import logging
 import os
+import orjson
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -33,8 +33,8 @@ def load_ingredients_json():
     
     logger.info(f"📂 JSON 파일 로드: {json_path}")
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(json_path, 'rb') as f:
+        data = orjson.loads(f.read())
     
     logger.info(f"✅ {len(data)}개 성분 로드 완료")
     return data
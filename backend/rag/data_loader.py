@@ -3,14 +3,22 @@
 Supabase 및 JSON 파일에서 성분 데이터 로드
 """
 
-import json
 import logging
-from typing import List, Dict
+from bisect import bisect_left
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 
+import numpy as np
+import orjson
+
+from rag.normalize import find_similar_name, normalize_name
+from rag.prepare import prepare_ingredient
 from supabase_client import (
     is_supabase_available,
-    get_all_ingredients,
-    get_ingredients_by_names
+    iter_all_ingredients,
+    get_ingredients_by_names,
+    warm_ingredient_cache
 )
 
 logger = logging.getLogger(__name__)
@@ -37,7 +45,18 @@ class DataLoader:
         # 인덱스 캐시 (효율성 개선: O(1) 검색을 위해)
         self._kor_index = None
         self._eng_index = None
+        # 정렬된 (정규화 키, 데이터 순서) 목록 (부분 매칭 시 bisect 접두사 탐색용)
+        self._kor_sorted: List[Tuple[str, int]] = []
+        self._eng_sorted: List[Tuple[str, int]] = []
+        # 데이터 순서의 정규화 키 목록 (유사 이름 매칭용)
+        self._kor_keys: List[str] = []
+        self._eng_keys: List[str] = []
+        # 성분명 컬럼 배열 (SoA) 및 표시명 캐시
+        self._kor_names = None
+        self._eng_names = None
+        self._display_names: List[str] = []
         self._load_data()
+        self._build_name_columns()
     
     def _load_data(self):
         """
@@ -45,17 +64,28 @@ class DataLoader:
         
         우선순위:
         1. Supabase PostgreSQL
-        2. JSON 파일 (폴백)
+        2. JSON 파일 (폴백, Supabase 연결 또는 전체 성분 로드 실패 시)
+        
+        데이터가 바뀌므로 기존 검색 인덱스는 무효화됩니다.
         """
+        self._invalidate_indexes()
         if is_supabase_available():
             logger.info("✅ Supabase 연결 성공!")
-            self.use_supabase = True
-            self.ingredients_data = get_all_ingredients()
-            logger.info(f"📊 Supabase에서 {len(self.ingredients_data)}개 성분 로드")
+            try:
+                # 페이지 단위로 받아 다음 페이지 조회와 현재 페이지 전처리를 겹쳐 수행
+                self.ingredients_data = [prepare_ingredient(item) for item in iter_all_ingredients()]
+                self.use_supabase = True
+                logger.info(f"📊 Supabase에서 {len(self.ingredients_data)}개 성분 로드")
+                # 같은 행으로 이름 인덱스 캐시를 채워 첫 요청이 전체 테이블을 다시 조회하지 않도록 함
+                warm_ingredient_cache(self.ingredients_data)
+                return
+            except Exception:
+                # 일부 페이지만 받은 데이터는 사용하지 않음 (오류는 iter_all_ingredients에서 기록)
+                logger.warning("⚠️ Supabase 성분 로드 실패, JSON 파일 사용")
         else:
             logger.warning("⚠️ Supabase 연결 실패, JSON 파일 사용")
-            self.use_supabase = False
-            self._load_json_data()
+        self.use_supabase = False
+        self._load_json_data()
     
     def _load_json_data(self):
         """
@@ -72,27 +102,28 @@ class DataLoader:
         - good_for → good_for (리스트로 변환)
         - bad_for → bad_for (리스트로 변환)
         
+        목록형 필드는 prepare_ingredient()에서 리스트로 정규화됩니다.
+        
         Raises:
             FileNotFoundError: JSON 파일이 없을 경우
-            json.JSONDecodeError: JSON 파싱 오류
+            orjson.JSONDecodeError: JSON 파싱 오류
             IOError: 파일 읽기 오류
         """
         logger.info("📚 JSON 파일에서 데이터 로드 중...")
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            raw_data = orjson.loads(Path(self.data_file).read_bytes())
             
             # Supabase 형식으로 변환
             self.ingredients_data = []
             for item in raw_data:
-                self.ingredients_data.append({
+                self.ingredients_data.append(prepare_ingredient({
                     "kor_name": item.get("INGR_KOR_NAME", ""),
                     "eng_name": item.get("INGR_ENG_NAME", ""),
                     "description": item.get("description", ""),
-                    "purpose": item.get("purpose") or [],
-                    "good_for": item.get("good_for") or [],
-                    "bad_for": item.get("bad_for") or []
-                })
+                    "purpose": item.get("purpose"),
+                    "good_for": item.get("good_for"),
+                    "bad_for": item.get("bad_for")
+                }))
             
             logger.info(f"✅ {len(self.ingredients_data)}개 성분 로드 완료")
             # 인덱스 생성 (효율성 개선: O(1) 검색)
@@ -100,7 +131,7 @@ class DataLoader:
         except FileNotFoundError as e:
             logger.error(f"❌ JSON 파일을 찾을 수 없습니다: {self.data_file}", exc_info=True)
             self.ingredients_data = []
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"❌ JSON 파싱 오류: {e}", exc_info=True)
             self.ingredients_data = []
         except IOError as e:
@@ -110,12 +141,22 @@ class DataLoader:
             logger.error(f"❌ JSON 로드 실패 (예상치 못한 오류): {e}", exc_info=True)
             self.ingredients_data = []
     
+    def _invalidate_indexes(self):
+        """검색 인덱스를 무효화합니다 (ingredients_data 변경 시 호출)."""
+        self._kor_index = None
+        self._eng_index = None
+        self._kor_sorted = []
+        self._eng_sorted = []
+        self._kor_keys = []
+        self._eng_keys = []
+    
     def _build_indexes(self):
         """
         검색 인덱스를 생성합니다.
         
         효율성 개선: O(n) 선형 검색 대신 O(1) 해시 테이블 검색 사용
         인덱스는 한 번만 생성하고 재사용합니다.
+        부분 매칭용으로 정규화 키를 정렬한 목록도 함께 생성합니다.
         """
         if self._kor_index is not None and self._eng_index is not None:
             return  # 이미 인덱스가 생성되어 있음
@@ -128,15 +169,51 @@ class DataLoader:
             eng_name = item.get('eng_name', '')
             
             if kor_name:
-                normalized_kor = kor_name.lower().replace(" ", "")
-                self._kor_index[normalized_kor] = item
+                self._kor_index[normalize_name(kor_name)] = item
             
             if eng_name:
-                normalized_eng = eng_name.lower().replace(" ", "")
-                self._eng_index[normalized_eng] = item
+                self._eng_index[normalize_name(eng_name)] = item
+        
+        self._kor_sorted = sorted((key, order) for order, key in enumerate(self._kor_index))
+        self._eng_sorted = sorted((key, order) for order, key in enumerate(self._eng_index))
+        self._kor_keys = list(self._kor_index)
+        self._eng_keys = list(self._eng_index)
         
         logger.debug(f"인덱스 생성 완료: 한국어 {len(self._kor_index)}개, 영어 {len(self._eng_index)}개")
     
+    def _build_name_columns(self):
+        """
+        성분명 컬럼 배열과 표시명 목록을 생성합니다.
+        
+        리스트-오브-딕셔너리(AoS) 대신 한국어/영어 이름을 각각 numpy 배열(SoA)로
+        보관하고, "한국어명 (영어명)" 표시명을 벡터 연산으로 한 번에 계산합니다.
+        이름이 모두 없는 항목은 표시명에서 제외됩니다.
+        """
+        self._kor_names = np.array(
+            [item.get('kor_name') or '' for item in self.ingredients_data], dtype=object
+        )
+        self._eng_names = np.array(
+            [item.get('eng_name') or '' for item in self.ingredients_data], dtype=object
+        )
+        
+        has_kor = self._kor_names != ''
+        has_eng = self._eng_names != ''
+        display = np.where(
+            has_kor & has_eng,
+            self._kor_names + ' (' + self._eng_names + ')',
+            np.where(has_kor, self._kor_names, self._eng_names)
+        )
+        self._display_names = display[has_kor | has_eng].tolist()
+    
+    def get_display_names(self) -> List[str]:
+        """
+        성분 표시명 목록을 반환합니다.
+        
+        Returns:
+            "한국어명 (영어명)", "한국어명" 또는 "영어명" 형식의 표시명 리스트
+        """
+        return self._display_names
+    
     def get_ingredients_by_names(self, names: List[str]) -> Dict[str, Dict]:
         """
         여러 성분명으로 일괄 검색
@@ -145,13 +222,14 @@ class DataLoader:
             names: 검색할 성분명 리스트
         
         Returns:
-            성분명 → 성분 정보 딕셔너리 매핑
+            성분명 → 성분 정보 딕셔너리 매핑 (목록형 필드 평탄화 완료, Supabase 행은 읽기 전용 매핑)
         
         Raises:
             Exception: 검색 중 오류 발생 시 (빈 딕셔너리 반환)
         """
         try:
             if self.use_supabase:
+                # Supabase 캐시 행은 캐시에 넣을 때 한 번 전처리된 읽기 전용 매핑 (복사 없이 공유)
                 return get_ingredients_by_names(names)
             else:
                 return self._get_ingredients_from_local(names)
@@ -165,12 +243,13 @@ class DataLoader:
         
         효율성 개선:
         - 인덱스를 한 번만 생성하고 재사용 (O(1) 검색)
-        - 이전: 매번 O(n) 선형 검색으로 인덱스 재생성
-        - 개선: 초기화 시 한 번만 인덱스 생성, 이후 O(1) 검색
+        - 부분 매칭은 정렬된 키 목록의 bisect 접두사 탐색을 먼저 시도 (O(log n + k))
         
         검색 방식:
         1. 정확 매칭: 한국어 이름 또는 영어 이름으로 정확히 일치 (O(1))
-        2. 부분 매칭: 정확 매칭이 없으면 부분 문자열로 검색 (O(n), 최후의 수단)
+        2. 부분 매칭: 언어별로 접두사 탐색으로 후보를 찾고, 후보보다 앞선 키만 부분 문자열 검사
+           (후보가 없으면 O(n), 최후의 수단)
+        3. 유사 이름 매칭: rapidfuzz ratio로 오타/표기 차이 허용 (rapidfuzz 설치 시)
         
         Args:
             names: 검색할 성분명 리스트
@@ -185,7 +264,7 @@ class DataLoader:
         result_map = {}
         
         for name in names:
-            normalized = name.strip().lower().replace(" ", "")
+            normalized = normalize_name(name)
             
             # 정확 매칭 (O(1))
             if normalized in self._kor_index:
@@ -195,23 +274,73 @@ class DataLoader:
                 result_map[name] = self._eng_index[normalized]
                 continue
             
-            # 부분 매칭 (O(n), 최후의 수단)
-            # 정확 매칭이 없을 때만 부분 매칭 시도
-            found = False
-            for kor_name, item in self._kor_index.items():
-                if normalized in kor_name or kor_name in normalized:
-                    result_map[name] = item
-                    found = True
-                    break
-            
-            if not found:
-                for eng_name, item in self._eng_index.items():
-                    if normalized in eng_name or eng_name in normalized:
-                        result_map[name] = item
-                        break
+            # 부분 매칭 (정확 매칭이 없을 때만, 한국어 우선)
+            item = (
+                self._find_partial(normalized, self._kor_index, self._kor_sorted)
+                or self._find_partial(normalized, self._eng_index, self._eng_sorted)
+                # 유사 이름 매칭 (오타/표기 차이, 최후의 수단, Supabase 캐시와 같은 규칙)
+                or self._find_similar(normalized, self._kor_index, self._kor_keys)
+                or self._find_similar(normalized, self._eng_index, self._eng_keys)
+            )
+            if item is not None:
+                result_map[name] = item
         
         return result_map
     
+    @staticmethod
+    def _find_partial(normalized: str, index: Dict[str, Dict],
+                      sorted_keys: List[Tuple[str, int]]) -> Optional[Dict]:
+        """
+        정규화된 이름과 부분적으로 일치하는 성분을 찾습니다.
+        
+        검색어를 포함하거나 검색어에 포함되는 키 중 데이터 순서가 가장 빠른 성분을 반환합니다
+        (Supabase 캐시의 부분 매칭과 같은 결과).
+        
+        탐색 순서:
+        1. 검색어로 시작하는 키 중 데이터 순서가 가장 빠른 후보 (bisect, O(log n + k))
+        2. 후보보다 앞선 키만 선형 검사 (후보가 없으면 전체 검사)
+        
+        Args:
+            normalized: 정규화된 검색어
+            index: 정규화 키 → 성분 정보 인덱스 (데이터 순서)
+            sorted_keys: 정렬된 (정규화 키, 데이터 순서) 목록
+        
+        Returns:
+            성분 정보 딕셔너리 또는 None
+        """
+        if not normalized:
+            return None
+        
+        best_order, best_key = len(sorted_keys), None
+        position = bisect_left(sorted_keys, (normalized,))
+        while position < len(sorted_keys) and sorted_keys[position][0].startswith(normalized):
+            key, order = sorted_keys[position]
+            if order < best_order:
+                best_order, best_key = order, key
+            position += 1
+        
+        # 후보보다 앞에 있으면서 검색어를 중간에 포함하는(또는 검색어 중간에 포함되는) 키가 우선
+        for key, item in islice(index.items(), best_order):
+            if normalized in key or key in normalized:
+                return item
+        return index[best_key] if best_key is not None else None
+    
+    @staticmethod
+    def _find_similar(normalized: str, index: Dict[str, Dict], keys: List[str]) -> Optional[Dict]:
+        """
+        오타/표기 차이를 허용하여 가장 비슷한 이름의 성분을 찾습니다.
+        
+        Args:
+            normalized: 정규화된 검색어
+            index: 정규화 키 → 성분 정보 인덱스
+            keys: 데이터 순서의 정규화 키 목록 (인덱스 생성 시 한 번 만든 목록)
+        
+        Returns:
+            성분 정보 딕셔너리 또는 None
+        """
+        position = find_similar_name(normalized, keys)
+        return index[keys[position]] if position is not None else None
+    
     def get_data_source(self) -> str:
         """
         현재 사용 중인 데이터 소스를 반환합니다.
@@ -0,0 +1,101 @@
+"""
+임베딩 배처 모듈
+동시에 들어온 쿼리 임베딩 요청을 짧은 시간 창 동안 모아 한 번에 인코딩
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 인코딩할 최대 쿼리 수
+BATCH_MAX_SIZE = 32
+# 첫 요청 이후 추가 요청을 기다리는 시간 (초)
+BATCH_WINDOW_SECONDS = 0.005
+
+
+class EmbeddingBatcher:
+    """
+    쿼리 임베딩 마이크로 배처
+
+    /search 요청은 스레드풀에서 동기 실행되므로, 각 스레드가 큐에 요청을 넣고
+    Future를 기다립니다. 백그라운드 스레드 하나가 첫 요청 이후 window초 동안
+    최대 max_batch_size개를 모아 embed_documents 한 번으로 인코딩한 뒤
+    각 Future에 해당 행을 전달합니다.
+
+    Args:
+        embeddings: embed_documents를 제공하는 임베딩 인스턴스
+        max_batch_size: 한 번에 인코딩할 최대 쿼리 수
+        window: 추가 요청 대기 시간 (초)
+    """
+
+    def __init__(self, embeddings, max_batch_size: int = BATCH_MAX_SIZE,
+                 window: float = BATCH_WINDOW_SECONDS):
+        """
+        배처 초기화 및 백그라운드 스레드 시작
+
+        Args:
+            embeddings: embed_documents를 제공하는 임베딩 인스턴스
+            max_batch_size: 한 번에 인코딩할 최대 쿼리 수
+            window: 추가 요청 대기 시간 (초)
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="embedding-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def embed(self, text: str) -> List[float]:
+        """
+        쿼리 하나를 임베딩합니다 (다른 동시 요청과 함께 배치 인코딩).
+
+        Args:
+            text: 쿼리 텍스트
+
+        Returns:
+            임베딩 벡터
+
+        Raises:
+            Exception: 배치 인코딩 중 발생한 예외
+        """
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _collect(self) -> list:
+        """첫 요청을 기다린 뒤 시간 창 동안 추가 요청을 모읍니다."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """백그라운드 배치 인코딩 루프"""
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception as e:
+                logger.error(f"❌ 배치 임베딩 오류: {e}", exc_info=True)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
@@ -0,0 +1,194 @@
+"""
+임베딩 인덱스 모듈
+양자화된 문서 임베딩 행렬에 대한 인메모리 유사도 검색
+"""
+
+import logging
+from typing import List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 지원하는 저장 정밀도
+PRECISIONS = ("bf16", "int8", "fp32")
+
+try:
+    from numba import njit, prange
+
+    # 시그니처를 명시하여 import 시 바로 컴파일 (첫 요청의 JIT 지연 방지)
+    @njit("float32[:](int8[:, :], float32[:], int8[:], float32)",
+          parallel=True, fastmath=True, cache=True)
+    def _int8_scores_kernel(codes, scales, query_codes, query_scale):
+        """int8 행렬-벡터 정수 내적(int32 누적) 후 스케일을 곱합니다 (행 단위 병렬)."""
+        count, dim = codes.shape
+        scores = np.empty(count, dtype=np.float32)
+        for i in prange(count):
+            acc = 0
+            for j in range(dim):
+                acc += np.int32(codes[i, j]) * np.int32(query_codes[j])
+            scores[i] = acc * scales[i] * query_scale
+        return scores
+except ImportError:
+    _int8_scores_kernel = None
+
+
+def _to_bfloat16(matrix: np.ndarray) -> np.ndarray:
+    """FP32 행렬을 BF16 비트 패턴(uint16)으로 변환합니다 (round-to-nearest-even)."""
+    bits = matrix.view(np.uint32)
+    rounded = bits + np.uint32(0x7FFF) + ((bits >> np.uint32(16)) & np.uint32(1))
+    return (rounded >> np.uint32(16)).astype(np.uint16)
+
+
+def _from_bfloat16(codes: np.ndarray) -> np.ndarray:
+    """BF16 비트 패턴(uint16)을 FP32 행렬로 복원합니다."""
+    return (codes.astype(np.uint32) << np.uint32(16)).view(np.float32)
+
+
+def _quantize_int8(matrix: np.ndarray):
+    """
+    행 단위 대칭 int8 양자화를 수행합니다.
+
+    Args:
+        matrix: (N, d) FP32 행렬
+
+    Returns:
+        (codes, scales) 튜플 - (N, d) int8 코드와 (N,) FP32 스케일 (x ≈ codes * scale)
+    """
+    scales = np.maximum(np.abs(matrix).max(axis=1) / 127.0, 1e-12).astype(np.float32)
+    codes = np.round(matrix / scales[:, np.newaxis]).clip(-127, 127).astype(np.int8)
+    return codes, scales
+
+
+class EmbeddingIndex:
+    """
+    양자화 임베딩 인덱스
+
+    문서 임베딩을 L2 정규화한 뒤 지정한 정밀도로 보관하고 코사인 유사도로 검색합니다.
+
+    저장 정밀도:
+    - int8 (기본값): 벡터별 대칭 스케일(max|v| / 127)로 양자화. 메모리 1/4
+    - bf16: FP32의 상위 16비트만 보관. 메모리 1/2, 384차원에서 재현율 손실은 무시할 수준
+    - fp32: 원본 그대로 보관
+
+    int8은 쿼리도 같은 방식으로 int8로 양자화하여 정수 내적(int32 누적) 후 스케일을 곱합니다.
+        score_i = (Q_i · q8) * scale_i * q_scale
+    bf16은 점수 계산 시 FP32로 복원합니다.
+    numba가 설치되어 있으면 int8 점수 계산은 행 단위 병렬 JIT 커널로 수행합니다.
+
+    Args:
+        embeddings: (N, d) 문서 임베딩 행렬
+        ids: 각 행에 대응하는 성분 id (한 성분이 여러 행을 가질 수 있음)
+        precision: 저장 정밀도 ("bf16", "int8", "fp32")
+    """
+
+    def __init__(self, embeddings: Sequence[Sequence[float]], ids: Sequence[int], precision: str = "int8"):
+        """
+        인덱스를 생성합니다.
+
+        Args:
+            embeddings: (N, d) 문서 임베딩 행렬
+            ids: 각 행에 대응하는 성분 id
+            precision: 저장 정밀도 ("bf16", "int8", "fp32")
+
+        Raises:
+            ValueError: 지원하지 않는 정밀도일 경우
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"지원하지 않는 임베딩 정밀도입니다: {precision} (지원: {', '.join(PRECISIONS)})")
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+        self.precision = precision
+        self.ids = np.asarray(ids, dtype=np.int64)
+
+        if precision == "int8":
+            self.codes, self.scales = _quantize_int8(matrix)
+        elif precision == "bf16":
+            self.codes = _to_bfloat16(np.ascontiguousarray(matrix))
+        else:
+            self.codes = matrix
+
+        logger.info(
+            f"🧮 {precision.upper()} 임베딩 인덱스 생성: {self.codes.shape[0]}개 벡터, "
+            f"{self.codes.nbytes / 1024:.0f}KB (FP32 {matrix.nbytes / 1024:.0f}KB)"
+        )
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """
+        쿼리 벡터와 모든 문서 벡터의 유사도를 계산합니다.
+
+        Args:
+            query: (d,) 쿼리 임베딩
+
+        Returns:
+            (N,) 유사도 배열 (쿼리 노름에 비례, 순위 비교용)
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if self.precision == "int8":
+            query_codes, query_scale = _quantize_int8(query[np.newaxis, :])
+            if _int8_scores_kernel is not None:
+                # numba 커널은 int32로 변환한 행렬 사본 없이 행 단위로 바로 누적
+                return _int8_scores_kernel(self.codes, self.scales, query_codes[0], query_scale[0])
+            dots = self.codes @ query_codes[0].astype(np.int32)
+            return dots * (self.scales * query_scale[0])
+        if self.precision == "bf16":
+            return _from_bfloat16(self.codes) @ query
+        return self.codes @ query
+
+    def search(self, query: np.ndarray, top_k: int = 3) -> List[int]:
+        """
+        유사도가 높은 순으로 성분 id를 반환합니다.
+
+        같은 성분의 여러 행(청크)이 검색되면 첫 번째만 사용합니다.
+
+        Args:
+            query: (d,) 쿼리 임베딩
+            top_k: 반환할 최대 성분 개수
+
+        Returns:
+            성분 id 리스트 (유사도 내림차순)
+        """
+        if len(self) == 0 or top_k <= 0:
+            return []
+
+        scores = self.scores(query)
+        count = len(scores)
+
+        # 한 성분이 여러 행(청크)을 가질 수 있으므로 여유 있게 후보를 뽑고 후보만 정렬
+        candidates = min(count, top_k * 4)
+        if candidates < count:
+            rows = np.argpartition(-scores, candidates - 1)[:candidates]
+            order = rows[np.argsort(-scores[rows])]
+        else:
+            order = np.argsort(-scores)
+
+        results = self._unique_ids(order, top_k)
+        if len(results) < top_k and candidates < count:
+            # 후보가 모두 같은 성분의 청크였던 드문 경우에만 전체 정렬
+            results = self._unique_ids(np.argsort(-scores), top_k)
+        return results
+
+    def _unique_ids(self, order: np.ndarray, top_k: int) -> List[int]:
+        """
+        정렬된 행 순서에서 중복 없는 성분 id를 최대 top_k개 뽑습니다.
+
+        Args:
+            order: 유사도 내림차순 행 인덱스
+            top_k: 반환할 최대 성분 개수
+
+        Returns:
+            성분 id 리스트
+        """
+        results = []
+        for row in order:
+            ingredient_id = int(self.ids[row])
+            if ingredient_id not in results:
+                results.append(ingredient_id)
+                if len(results) == top_k:
+                    break
+        return results
@@ -3,9 +3,10 @@ Enterprise RAG 클래스
 엔터프라이즈급 RAG 시스템 구현
 """
 
+import heapq
 import logging
+from operator import itemgetter
 from typing import List, Dict
-from collections import Counter
 
 import sys
 import os
@@ -14,10 +15,39 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from rag.data_loader import DataLoader
 from rag.vector_store import VectorStore
 from rag.ingredient_search import IngredientSearch
+from rag.query_cache import QueryCache
+from rag.skin_type import parse_skin_type
 from llm.mock_llm import MockLLM
+from supabase_client import invalidate_ingredients_cache
 
 logger = logging.getLogger(__name__)
 
+# 분석 결과 캐시 설정 (같은 제품 + 피부 타입 조합이 반복 요청됨)
+ANALYSIS_CACHE_SIZE = 512
+ANALYSIS_CACHE_TTL_SECONDS = 300
+
+
+def build_analysis_prompt(skin_type: str, good_names: List[str], bad_names: List[str],
+                          common_purposes_str: str) -> str:
+    """
+    제품 종합 분석 리포트 생성용 프롬프트를 만듭니다.
+    
+    Args:
+        skin_type: 사용자 피부 타입
+        good_names: 좋은 성분 표시명 리스트
+        bad_names: 주의 성분 표시명 리스트
+        common_purposes_str: 상위 성분 목적 문자열 (예: "moisturizer (3회)")
+    
+    Returns:
+        LLM 프롬프트 문자열
+    """
+    return f"""종합 분석 리포트 생성
+사용자 피부 타입: {skin_type}
+좋은 성분 목록: {', '.join(good_names) if good_names else '없음'}
+주의 성분 목록 (일반적 포함): {', '.join(bad_names) if bad_names else '없음'}
+참고용 (주요 성분 목적): {common_purposes_str}
+"""
+
 
 class EnterpriseRAG:
     """
@@ -53,16 +83,26 @@ class EnterpriseRAG:
         
         # LangChain 컴포넌트
         self.llm = MockLLM()
+        # 좋은/주의 성분과 성분 목적이 모두 없을 때의 리포트 (입력이 항상 같으므로 한 번만 생성하여 LLM 호출 생략)
+        self.empty_analysis_report = self.llm.invoke(build_analysis_prompt("", [], [], ""))
         
-        # 벡터 스토어 초기화
+        # 벡터 스토어 (지연 초기화)
+        # 벡터 검색은 JSON 폴백 모드에서만 사용하므로 그때만 시작 시점에 미리 생성
         self.vector_store = VectorStore(
             self.data_loader.ingredients_data,
             persist_directory
         )
+        if not self.use_supabase:
+            self.vector_store.ensure_vectorstore()
+        
+        # (성분 리스트, 피부 타입) → 분석 결과 캐시
+        self.analysis_cache = QueryCache(
+            maxsize=ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL_SECONDS
+        )
         
         # 성분 검색 초기화
-        from rag.memory import ConversationManager
-        self.conversation_manager = ConversationManager()
+        from rag.memory import create_conversation_manager
+        self.conversation_manager = create_conversation_manager()
         self.ingredient_search = IngredientSearch(
             self.use_supabase,
             self.vector_store,
@@ -89,6 +129,33 @@ class EnterpriseRAG:
         """
         return self.data_loader.get_ingredients_count()
     
+    def get_cache_stats(self) -> Dict:
+        """
+        검색 결과 캐시 통계를 반환합니다.
+        
+        Returns:
+            검색 캐시(정확 일치, 유사도)와 분석 캐시의 통계 딕셔너리 (항목 수, 적중/미스 횟수, 적중률 등)
+        """
+        return {
+            "exact": self.ingredient_search.cache.stats(),
+            "semantic": self.ingredient_search.semantic_cache.stats(),
+            "analysis": self.analysis_cache.stats()
+        }
+    
+    def clear_caches(self):
+        """
+        검색/분석 결과 캐시와 Supabase 성분 캐시를 모두 비웁니다.
+        
+        성분 테이블이 갱신된 뒤 호출하면 검색/분석 요청은 데이터베이스에서 다시 조회합니다.
+        시작 시 로드한 ingredients_data와 미리 직렬화한 /ingredients, /health 응답은
+        갱신되지 않으므로 전체 반영은 서버 재시작이 필요합니다.
+        """
+        self.ingredient_search.clear_cache()
+        self.analysis_cache.clear()
+        if self.use_supabase:
+            invalidate_ingredients_cache()
+        logger.info("🧹 검색/분석 캐시 초기화")
+    
     def search_ingredients(self, query: str, session_id: str = None, top_k: int = 3) -> Dict:
         """
         성분을 검색합니다.
@@ -113,6 +180,27 @@ class EnterpriseRAG:
             ingredients: 분석할 성분명 리스트
             skin_type: 사용자 피부 타입 (예: "건성, 민감성")
         
+        Returns:
+            분석 결과 딕셔너리
+        """
+        # 같은 성분 리스트(순서 포함)와 피부 타입이면 결과가 같으므로 캐시 사용
+        # 분석 실패 결과는 캐시하지 않음
+        cache_key = (tuple(ingredients), skin_type)
+        result = self.analysis_cache.get(cache_key)
+        if result is None:
+            result = self._analyze_product_ingredients(ingredients, skin_type)
+            if result["success"]:
+                self.analysis_cache.set(cache_key, result)
+        return result
+    
+    def _analyze_product_ingredients(self, ingredients: List[str], skin_type: str) -> Dict:
+        """
+        제품의 성분을 분석합니다 (캐시 미사용).
+        
+        Args:
+            ingredients: 분석할 성분명 리스트
+            skin_type: 사용자 피부 타입
+        
         Returns:
             분석 결과 딕셔너리
         """
@@ -129,78 +217,66 @@ class EnterpriseRAG:
                     "success": False
                 }
             
-            # 피부 타입 매핑
-            skin_type_map = {
-                "건성": "dry", "지성": "oily", "민감성": "sensitive",
-                "여드름성": "acne", "복합성": "combination", "중성": "normal"
-            }
-            normalized_skin_type = skin_type_map.get(skin_type, skin_type.lower())
+            # 피부 타입 비트마스크 (요청당 한 번 계산, 성분별 비교는 정수 AND)
+            user_mask = parse_skin_type(skin_type)
             
             good_matches = []
             bad_matches = []
             good_names = []
             bad_names = []
+            bad_names_set = set()
+            # 성분 목적 집계 (purpose는 로드 시 리스트로 정규화되어 있음)
+            purpose_counts = {}
             
             for ingredient_name, info in ingredient_info_map.items():
-                good_for = info.get('good_for', []) or []
-                bad_for = info.get('bad_for', []) or []
-                purpose = info.get('purpose', []) or []
-                description = info.get('description', '')
-                display_name = info.get('kor_name') or info.get('eng_name') or ingredient_name
+                for purpose in info['purpose']:
+                    purpose_counts[purpose] = purpose_counts.get(purpose, 0) + 1
                 
-                # 리스트로 변환
-                if isinstance(good_for, str):
-                    good_for = [g.strip() for g in good_for.split(',') if g.strip()]
-                if isinstance(bad_for, str):
-                    bad_for = [b.strip() for b in bad_for.split(',') if b.strip()]
-                if isinstance(purpose, str):
-                    purpose = [p.strip() for p in purpose.split(',') if p.strip()]
+                good_mask = info['_good_for_mask']
+                direct_bad = info['_bad_for_mask'] & user_mask
+                short_desc = info['_description_100']
+                display_name = info.get('kor_name') or info.get('eng_name') or ingredient_name
                 
                 # good_for 분석
-                if normalized_skin_type in good_for or skin_type in good_for:
+                if good_mask & user_mask:
                     good_matches.append({
                         "name": display_name,
-                        "purpose": ', '.join(purpose) if purpose else "기능 정보 없음"
+                        "purpose": info['_purpose_str'] or "기능 정보 없음"
                     })
                     good_names.append(display_name)
                 
-                # bad_for 분석
-                if normalized_skin_type in bad_for or skin_type in bad_for:
-                    short_desc = description[:100] + "..." if len(description) > 100 else description
+                # bad_for 분석 (사용자 피부 타입 직접 매칭, 또는 민감성/여드름성 주의 성분)
+                if direct_bad or (info['_risky'] and display_name not in bad_names_set):
+                    if short_desc:
+                        caution = short_desc
+                    elif direct_bad:
+                        caution = f"{skin_type} 피부에 주의가 필요합니다."
+                    else:
+                        caution = "일부 피부에 자극을 줄 수 있습니다."
                     bad_matches.append({
                         "name": display_name,
-                        "description": short_desc if short_desc else f"{skin_type} 피부에 주의가 필요합니다."
+                        "description": caution
                     })
                     bad_names.append(display_name)
-                elif any(kw in bad_for for kw in ["sensitive", "민감성", "acne", "여드름"]):
-                    if display_name not in bad_names:
-                        short_desc = description[:100] + "..." if len(description) > 100 else description
-                        bad_matches.append({
-                            "name": display_name,
-                            "description": short_desc if short_desc else "일부 피부에 자극을 줄 수 있습니다."
-                        })
-                        bad_names.append(display_name)
+                    bad_names_set.add(display_name)
             
-            # 성분 목적 집계
-            all_purposes = []
-            for info in ingredient_info_map.values():
-                purpose = info.get('purpose', []) or []
-                if isinstance(purpose, list):
-                    all_purposes.extend(purpose)
-                elif isinstance(purpose, str):
-                    all_purposes.extend([p.strip() for p in purpose.split(',') if p.strip()])
+            # 상위 3개 목적 (Counter.most_common과 같이 동률은 먼저 나온 순서 유지)
+            top_purposes = heapq.nlargest(3, purpose_counts.items(), key=itemgetter(1))
+            common_purposes_str = ", ".join([f"{p} ({c}회)" for p, c in top_purposes])
             
-            purpose_counts = Counter(all_purposes)
-            common_purposes_str = ", ".join([f"{p} ({c}회)" for p, c in purpose_counts.most_common(3)])
+            # 리포트에 담을 내용이 없으면 LLM 호출 생략
+            if not good_names and not bad_names and not common_purposes_str:
+                return {
+                    "analysis_report": self.empty_analysis_report,
+                    "good_matches": good_matches,
+                    "bad_matches": bad_matches,
+                    "success": True
+                }
             
             # 분석 리포트 생성
-            analysis_prompt = f"""종합 분석 리포트 생성
-사용자 피부 타입: {skin_type}
-좋은 성분 목록: {', '.join(good_names) if good_names else '없음'}
-주의 성분 목록 (일반적 포함): {', '.join(bad_names) if bad_names else '없음'}
-참고용 (주요 성분 목적): {common_purposes_str}
-"""
-            
+            analysis_prompt = build_analysis_prompt(
+                skin_type, good_names, bad_names, common_purposes_str
+            )
             analysis_report = self.llm.invoke(analysis_prompt)
             
             return {
@@ -4,24 +4,51 @@ Supabase 및 벡터 검색을 통한 성분 검색
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from supabase_client import search_ingredients as supabase_search_ingredients
+from rag.prepare import prepare_ingredient
 from rag.vector_store import VectorStore
 from rag.memory import ConversationManager
+from rag.query_cache import QueryCache, SemanticQueryCache
 
 logger = logging.getLogger(__name__)
 
+# 검색 결과 캐시 설정
+SEARCH_CACHE_SIZE = 2000
+SEARCH_CACHE_TTL_SECONDS = 300
+# 유사도 캐시 적중 기준 (쿼리 임베딩 코사인 유사도, 벡터 검색 경로에서만 사용)
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92))
+
+# 캐시 미스 표시 (결과 없음(None)도 캐시하므로 별도 객체 사용)
+_MISS = object()
+
+
+def normalize_query(query: str) -> str:
+    """
+    검색 캐시 키용으로 쿼리를 정규화합니다.
+    
+    Args:
+        query: 검색 쿼리
+    
+    Returns:
+        소문자로 변환하고 앞뒤 공백 제거, 연속 공백을 하나로 줄인 문자열
+        (검색도 이 문자열로 수행하므로 결과는 캐시 키에만 의존)
+    """
+    return " ".join(query.lower().split())
+
 
 class IngredientSearch:
     """
     성분 검색 클래스
     
     Supabase 직접 검색 또는 벡터 검색을 통해 성분을 검색합니다.
+    검색 결과(답변, 유사 성분)는 세션과 무관하므로 정규화된 쿼리 기준으로 캐시하고,
+    대화 히스토리 저장만 요청마다 수행합니다.
     """
     
     def __init__(self, use_supabase: bool, vector_store: VectorStore = None, conversation_manager: ConversationManager = None):
@@ -36,6 +63,17 @@ class IngredientSearch:
         self.use_supabase = use_supabase
         self.vector_store = vector_store
         self.conversation_manager = conversation_manager or ConversationManager()
+        # (정규화 쿼리, top_k) → 검색 결과 LRU + TTL 캐시
+        self.cache = QueryCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL_SECONDS)
+        # 쿼리 임베딩 → 검색 결과 유사도 캐시 (정확 캐시 미스 시 표기만 다른 쿼리를 적중 처리)
+        self.semantic_cache = SemanticQueryCache(
+            maxsize=SEARCH_CACHE_SIZE, threshold=SEMANTIC_CACHE_THRESHOLD
+        )
+    
+    def clear_cache(self):
+        """검색 결과 캐시를 비웁니다 (성분 데이터 갱신 시 호출)."""
+        self.cache.clear()
+        self.semantic_cache.clear()
     
     def search(self, query: str, session_id: str = None, top_k: int = 3) -> Dict:
         """
@@ -45,6 +83,10 @@ class IngredientSearch:
         1. Supabase 사용 시: 직접 SQL 쿼리로 검색 (빠름)
         2. Supabase 미사용 시: ChromaDB 벡터 검색 (폴백)
         
+        같은 쿼리(`normalize_query` 기준)의 검색 결과는 캐시에서 재사용합니다.
+        벡터 검색 경로에서는 쿼리 임베딩이 유사한 이전 쿼리의 결과도 재사용합니다.
+        검색 실패 결과는 캐시하지 않습니다.
+        
         Args:
             query: 검색 쿼리 (성분명 또는 질문)
             session_id: 채팅 세션 ID (선택적)
@@ -57,21 +99,45 @@ class IngredientSearch:
         memory = self.conversation_manager.get_session(session_id)
         
         try:
-            # Supabase 직접 검색
-            if self.use_supabase:
-                return self._search_supabase(query, memory, session_id, top_k)
+            normalized = normalize_query(query)
+            cache_key = (normalized, top_k)
+            found = self.cache.get(cache_key, _MISS)
+            if found is _MISS:
+                try:
+                    found = self._find(normalized, top_k)
+                except Exception as e:
+                    source = "데이터베이스" if self.use_supabase else "벡터"
+                    logger.error(f"{source} 검색 오류 (query: {query}): {e}", exc_info=True)
+                    return {
+                        "query": query,
+                        "answer": f"{source} 검색 중 오류가 발생했습니다.",
+                        "similar_ingredients": [],
+                        "session_id": session_id,
+                        "chat_history": [],
+                        "success": False
+                    }
+                self.cache.set(cache_key, found)
             
-            # 벡터 검색 폴백
-            if self.vector_store:
-                return self._search_vector(query, memory, session_id, top_k)
+            if found is None:
+                return {
+                    "query": query,
+                    "answer": "해당 성분에 대한 정보를 찾을 수 없습니다.",
+                    "similar_ingredients": [],
+                    "session_id": session_id,
+                    "chat_history": [],
+                    "success": False
+                }
+            
+            answer, similar_ingredients = found
+            memory.save_context({"input": query}, {"output": answer})
             
             return {
                 "query": query,
-                "answer": "해당 성분에 대한 정보를 찾을 수 없습니다.",
-                "similar_ingredients": [],
+                "answer": answer,
+                "similar_ingredients": similar_ingredients,
                 "session_id": session_id,
-                "chat_history": [],
-                "success": False
+                "chat_history": memory.recent_messages,
+                "success": True
             }
             
         except Exception as e:
@@ -85,121 +151,96 @@ class IngredientSearch:
                 "success": False
             }
     
-    def _search_supabase(self, query: str, memory, session_id: str, top_k: int) -> Dict:
+    def _find(self, query: str, top_k: int) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        세션과 무관한 검색을 수행합니다.
+        
+        Args:
+            query: 정규화된 검색 쿼리
+            top_k: 반환할 최대 결과 개수
+        
+        Returns:
+            (답변, 유사 성분 리스트) 튜플, 결과가 없으면 None
+        
+        Raises:
+            Exception: Supabase 또는 벡터 검색 실패 시
+        """
+        # Supabase 직접 검색
+        if self.use_supabase:
+            return self._search_supabase(query, top_k)
+        
+        # 벡터 검색 폴백
+        if self.vector_store:
+            embedding = self.vector_store.embed_query(query)
+            found = self.semantic_cache.get(embedding, tag=top_k, default=_MISS)
+            if found is _MISS:
+                found = self._search_vector(embedding, top_k)
+                if found is not None:
+                    self.semantic_cache.set(embedding, found, tag=top_k)
+            return found
+        
+        return None
+    
+    def _search_supabase(self, query: str, top_k: int) -> Optional[Tuple[str, List[Dict]]]:
         """
         Supabase 직접 검색
         
         Args:
             query: 검색 쿼리
-            memory: 대화 메모리
-            session_id: 세션 ID
             top_k: 반환할 최대 결과 개수
         
         Returns:
-            검색 결과 딕셔너리
+            (답변, 유사 성분 리스트) 튜플, 결과가 없으면 None
+        
+        Raises:
+            Exception: 데이터베이스 오류 발생 시 (결과 없음으로 캐시되지 않도록 전파)
         """
-        try:
-            db_results = supabase_search_ingredients(query, limit=top_k)
-        except Exception as e:
-            logger.error(f"Supabase 검색 오류 (query: {query}): {e}", exc_info=True)
-            return {
-                "query": query,
-                "answer": "데이터베이스 검색 중 오류가 발생했습니다.",
-                "similar_ingredients": [],
-                "session_id": session_id,
-                "chat_history": [],
-                "success": False
-            }
+        db_results = supabase_search_ingredients(query, limit=top_k)
+        if not db_results:
+            return None
         
-        if db_results:
-            first_result = db_results[0]
-            answer = f"{first_result.get('kor_name', '')}에 대한 정보: {first_result.get('description', '')[:300]}"
-            
-            similar_ingredients = [{
-                "ingredient_kor": r.get('kor_name', ''),
-                "ingredient_eng": r.get('eng_name', ''),
-                "description": r.get('description', '')[:200],
-                "purpose": ', '.join(r.get('purpose', [])),
-                "good_for": ', '.join(r.get('good_for', [])),
-                "bad_for": ', '.join(r.get('bad_for', []))
-            } for r in db_results]
-            
-            memory.save_context({"input": query}, {"output": answer})
-            
-            return {
-                "query": query,
-                "answer": answer,
-                "similar_ingredients": similar_ingredients,
-                "session_id": session_id,
-                "chat_history": memory.messages[-4:],
-                "success": True
-            }
+        db_results = [prepare_ingredient(r) for r in db_results]
+        first_result = db_results[0]
+        answer = f"{first_result.get('kor_name', '')}에 대한 정보: {first_result.get('description', '')[:300]}"
         
-        return {
-            "query": query,
-            "answer": "해당 성분에 대한 정보를 찾을 수 없습니다.",
-            "similar_ingredients": [],
-            "session_id": session_id,
-            "chat_history": [],
-            "success": False
-        }
+        similar_ingredients = [{
+            "ingredient_kor": r.get('kor_name', ''),
+            "ingredient_eng": r.get('eng_name', ''),
+            "description": r.get('description', '')[:200],
+            "purpose": r['_purpose_str'],
+            "good_for": r['_good_for_str'],
+            "bad_for": r['_bad_for_str']
+        } for r in db_results]
+        
+        return answer, similar_ingredients
     
-    def _search_vector(self, query: str, memory, session_id: str, top_k: int) -> Dict:
+    def _search_vector(self, embedding, top_k: int) -> Optional[Tuple[str, List[Dict]]]:
         """
         벡터 검색
         
         Args:
-            query: 검색 쿼리
-            memory: 대화 메모리
-            session_id: 세션 ID
+            embedding: (d,) 쿼리 임베딩
             top_k: 반환할 최대 결과 개수
         
         Returns:
-            검색 결과 딕셔너리
+            (답변, 유사 성분 리스트) 튜플, 결과가 없으면 None
         """
-        try:
-            docs = self.vector_store.search(query, top_k)
-        except Exception as e:
-            logger.error(f"벡터 검색 오류 (query: {query}): {e}", exc_info=True)
-            return {
-                "query": query,
-                "answer": "벡터 검색 중 오류가 발생했습니다.",
-                "similar_ingredients": [],
-                "session_id": session_id,
-                "chat_history": [],
-                "success": False
-            }
+        matches = self.vector_store.search_by_vector(embedding, top_k)
+        if not matches:
+            return None
         
-        if docs:
-            first_doc = docs[0]
-            answer = f"{first_doc.metadata.get('ingredient_kor', '')}에 대한 정보: {first_doc.metadata.get('description', '')}"
-            
-            similar_ingredients = [{
-                "ingredient_kor": d.metadata.get('ingredient_kor', ''),
-                "ingredient_eng": d.metadata.get('ingredient_eng', ''),
-                "description": d.metadata.get('description', ''),
-                "purpose": d.metadata.get('purpose', ''),
-                "good_for": d.metadata.get('good_for', ''),
-                "bad_for": d.metadata.get('bad_for', '')
-            } for d in docs]
-            
-            memory.save_context({"input": query}, {"output": answer})
-            
-            return {
-                "query": query,
-                "answer": answer,
-                "similar_ingredients": similar_ingredients,
-                "session_id": session_id,
-                "chat_history": memory.messages[-4:],
-                "success": True
-            }
+        similar_ingredients = []
+        for item in matches:
+            similar_ingredients.append({
+                "ingredient_kor": item.get('kor_name', ''),
+                "ingredient_eng": item.get('eng_name', ''),
+                "description": item['_description_200'],
+                "purpose": item['_purpose_str'],
+                "good_for": item['_good_for_str'],
+                "bad_for": item['_bad_for_str']
+            })
         
-        return {
-            "query": query,
-            "answer": "해당 성분에 대한 정보를 찾을 수 없습니다.",
-            "similar_ingredients": [],
-            "session_id": session_id,
-            "chat_history": [],
-            "success": False
-        }
-
+        first = similar_ingredients[0]
+        answer = f"{first['ingredient_kor']}에 대한 정보: {first['description']}"
+        
+        return answer, similar_ingredients
@@ -3,9 +3,25 @@
 채팅 세션 관리
 """
 
+import logging
+import os
 import uuid
-from typing import Dict
-from datetime import datetime
+from collections import deque
+from typing import Dict, List
+from datetime import datetime, timedelta
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# 세션당 보관할 최대 메시지 수 (환경 변수 CHAT_HISTORY_MAX로 조정)
+MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX", 50))
+# 검색 응답에 포함할 최근 메시지 수
+RECENT_MESSAGES = 4
+# Redis 세션 저장소 설정 (REDIS_URL이 설정된 경우에만 사용)
+REDIS_URL = os.getenv("REDIS_URL")
+# 세션 만료 시간 (초, 마지막 활동 기준)
+SESSION_TTL_SECONDS = int(os.getenv("CHAT_SESSION_TTL", 3600))
 
 
 class SimpleConversationMemory:
@@ -14,13 +30,18 @@ class SimpleConversationMemory:
     
     채팅 세션의 대화 히스토리를 메모리에 저장합니다.
     각 메시지는 입력, 출력, 타임스탬프를 포함합니다.
+    최대 MAX_MESSAGES개까지만 보관하며, 오래된 메시지는 O(1)로 제거됩니다.
     
     Attributes:
-        messages: 대화 메시지 리스트
+        messages: 대화 메시지 deque (최대 길이 제한)
+        last_activity: 마지막 활동 시각 (ISO 8601 문자열)
     """
     def __init__(self):
         """대화 메모리 초기화"""
-        self.messages = []
+        self.messages = deque(maxlen=MAX_MESSAGES)
+        self.last_activity = datetime.now().isoformat()
+        # 최근 메시지를 별도로 유지하여 응답마다 슬라이싱하지 않음
+        self._recent = deque(maxlen=RECENT_MESSAGES)
     
     def save_context(self, inputs: Dict, outputs: Dict):
         """
@@ -30,15 +51,29 @@ class SimpleConversationMemory:
             inputs: 입력 딕셔너리 (예: {'input': '질문'})
             outputs: 출력 딕셔너리 (예: {'output': '답변'})
         """
-        self.messages.append({
+        self.last_activity = datetime.now().isoformat()
+        message = {
             'input': inputs.get('input', ''),
             'output': outputs.get('output', ''),
-            'timestamp': datetime.now().isoformat()
-        })
+            'timestamp': self.last_activity
+        }
+        self.messages.append(message)
+        self._recent.append(message)
+    
+    @property
+    def recent_messages(self) -> List[Dict]:
+        """
+        최근 메시지를 반환합니다.
+        
+        Returns:
+            최근 RECENT_MESSAGES개 메시지 리스트 (오래된 순)
+        """
+        return list(self._recent)
     
     def clear(self):
         """대화 히스토리를 모두 삭제합니다."""
         self.messages.clear()
+        self._recent.clear()
     
     @property
     def chat_memory(self):
@@ -74,19 +109,233 @@ class ConversationManager:
         """
         if session_id is None:
             session_id = str(uuid.uuid4())
-        if session_id not in self.chat_sessions:
-            self.chat_sessions[session_id] = SimpleConversationMemory()
+        memory = self.chat_sessions.get(session_id)
+        if memory is None:
+            self.chat_sessions.setdefault(session_id, SimpleConversationMemory())
+        else:
+            # 요청이 들어온 세션은 활동 중으로 표시하여 처리 도중 유휴 정리로 삭제되지 않도록 함
+            memory.last_activity = datetime.now().isoformat()
         return session_id
     
     def get_session(self, session_id: str) -> SimpleConversationMemory:
         """
         세션을 가져옵니다.
         
+        get_or_create_session 이후 유휴 정리로 세션이 삭제된 경우에도
+        None 대신 빈 세션을 다시 만들어 반환합니다.
+        
         Args:
             session_id: 세션 ID
         
         Returns:
             대화 메모리 객체
         """
-        return self.chat_sessions.get(session_id)
+        memory = self.chat_sessions.get(session_id)
+        if memory is None:
+            memory = self.chat_sessions.setdefault(session_id, SimpleConversationMemory())
+        return memory
+    
+    def evict_idle_sessions(self, ttl_seconds: int = SESSION_TTL_SECONDS) -> int:
+        """
+        마지막 활동 후 ttl_seconds가 지난 세션을 삭제합니다.
+        
+        Args:
+            ttl_seconds: 세션 만료 시간 (초)
+        
+        Returns:
+            삭제한 세션 수
+        """
+        cutoff = (datetime.now() - timedelta(seconds=ttl_seconds)).isoformat()
+        # ISO 8601 문자열은 사전순 비교가 시간순 비교와 같음
+        idle_ids = [
+            session_id for session_id, memory in list(self.chat_sessions.items())
+            if memory.last_activity < cutoff
+        ]
+        for session_id in idle_ids:
+            self.chat_sessions.pop(session_id, None)
+        return len(idle_ids)
+
 
+class RedisConversationMemory:
+    """
+    Redis 기반 대화 메모리 클래스
+    
+    `chat:{session_id}` 키의 리스트에 메시지를 최신순(LPUSH)으로 저장합니다.
+    리스트는 MAX_MESSAGES개로 잘라내고, 마지막 활동 기준 SESSION_TTL_SECONDS 후 만료됩니다.
+    SimpleConversationMemory와 같은 인터페이스를 제공합니다.
+    
+    Args:
+        client: 동기 Redis 클라이언트
+        session_id: 세션 ID
+    """
+    
+    def __init__(self, client, session_id: str):
+        """
+        대화 메모리 초기화
+        
+        Args:
+            client: 동기 Redis 클라이언트
+            session_id: 세션 ID
+        """
+        self.client = client
+        self.key = f"chat:{session_id}"
+        self.last_activity = datetime.now().isoformat()
+    
+    def save_context(self, inputs: Dict, outputs: Dict):
+        """
+        대화 컨텍스트를 저장합니다.
+        
+        LPUSH/LTRIM/EXPIRE를 하나의 파이프라인으로 전송합니다.
+        
+        Args:
+            inputs: 입력 딕셔너리 (예: {'input': '질문'})
+            outputs: 출력 딕셔너리 (예: {'output': '답변'})
+        """
+        self.last_activity = datetime.now().isoformat()
+        message = {
+            'input': inputs.get('input', ''),
+            'output': outputs.get('output', ''),
+            'timestamp': self.last_activity
+        }
+        pipe = self.client.pipeline()
+        pipe.lpush(self.key, orjson.dumps(message))
+        pipe.ltrim(self.key, 0, MAX_MESSAGES - 1)
+        pipe.expire(self.key, SESSION_TTL_SECONDS)
+        pipe.execute()
+    
+    def _range(self, count: int) -> List[Dict]:
+        """
+        최근 메시지를 오래된 순으로 조회합니다.
+        
+        Args:
+            count: 조회할 메시지 수 (-1이면 전체)
+        
+        Returns:
+            메시지 리스트 (오래된 순)
+        """
+        end = count - 1 if count > 0 else -1
+        raw_messages = self.client.lrange(self.key, 0, end)
+        return [orjson.loads(raw) for raw in reversed(raw_messages)]
+    
+    @property
+    def messages(self) -> List[Dict]:
+        """
+        저장된 전체 메시지를 반환합니다.
+        
+        Returns:
+            메시지 리스트 (오래된 순)
+        """
+        return self._range(-1)
+    
+    @property
+    def recent_messages(self) -> List[Dict]:
+        """
+        최근 메시지를 반환합니다.
+        
+        Returns:
+            최근 RECENT_MESSAGES개 메시지 리스트 (오래된 순)
+        """
+        return self._range(RECENT_MESSAGES)
+    
+    def clear(self):
+        """대화 히스토리를 모두 삭제합니다."""
+        self.client.delete(self.key)
+    
+    @property
+    def chat_memory(self):
+        """
+        채팅 메모리 객체를 반환합니다.
+        
+        Returns:
+            자기 자신 (LangChain 호환성을 위해)
+        """
+        return self
+
+
+class RedisConversationManager:
+    """
+    Redis 기반 대화 세션 관리자
+    
+    세션을 Redis에 저장하여 여러 uvicorn 워커가 같은 세션을 공유하고,
+    서버 재시작 후에도 대화 히스토리가 유지됩니다.
+    
+    Args:
+        client: 동기 Redis 클라이언트
+    """
+    
+    def __init__(self, client):
+        """
+        대화 관리자 초기화
+        
+        Args:
+            client: 동기 Redis 클라이언트
+        """
+        self.client = client
+    
+    def get_or_create_session(self, session_id: str = None) -> str:
+        """
+        채팅 세션을 가져오거나 새로 생성합니다.
+        
+        Redis 키는 첫 메시지 저장 시 생성되므로 여기서는 ID만 발급합니다.
+        
+        Args:
+            session_id: 세션 ID (없으면 새로 생성)
+        
+        Returns:
+            세션 ID
+        """
+        if session_id is None:
+            session_id = str(uuid.uuid4())
+        return session_id
+    
+    def get_session(self, session_id: str) -> RedisConversationMemory:
+        """
+        세션을 가져옵니다.
+        
+        Args:
+            session_id: 세션 ID
+        
+        Returns:
+            대화 메모리 객체
+        """
+        return RedisConversationMemory(self.client, session_id)
+    
+    def evict_idle_sessions(self, ttl_seconds: int = SESSION_TTL_SECONDS) -> int:
+        """
+        유휴 세션 정리 (Redis 키 TTL로 자동 만료되므로 수행할 작업 없음)
+        
+        Args:
+            ttl_seconds: 세션 만료 시간 (초, 사용하지 않음)
+        
+        Returns:
+            삭제한 세션 수 (항상 0)
+        """
+        return 0
+
+
+def create_conversation_manager():
+    """
+    환경에 맞는 대화 세션 관리자를 생성합니다.
+    
+    REDIS_URL이 설정되어 있고 연결에 성공하면 Redis 관리자를,
+    그렇지 않으면 인메모리 관리자를 반환합니다.
+    
+    검색은 스레드풀에서 실행되므로 동기 Redis 클라이언트를 사용합니다.
+    
+    Returns:
+        RedisConversationManager 또는 ConversationManager
+    """
+    if not REDIS_URL:
+        return ConversationManager()
+    
+    try:
+        import redis
+        client = redis.Redis.from_url(REDIS_URL)
+        client.ping()
+        logger.info("✅ Redis 세션 저장소 연결 완료")
+        return RedisConversationManager(client)
+    except ImportError:
+        logger.warning("⚠️ redis 패키지가 설치되지 않았습니다. 인메모리 세션 저장소 사용")
+    except Exception as e:
+        logger.error(f"❌ Redis 연결 실패, 인메모리 세션 저장소 사용: {e}", exc_info=True)
+    return ConversationManager()
@@ -0,0 +1,62 @@
+"""
+이름 정규화 모듈
+성분명 비교용 검색 키 생성 및 유사 이름 매칭 (Supabase 조회와 로컬 인덱스가 같은 규칙 사용)
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Optional, Sequence
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    process = None
+
+# 유사 이름 매칭 최소 점수 (rapidfuzz ratio, 0~100, 무관한 입력은 60 안팎)
+FUZZY_MATCH_CUTOFF = 80
+# 유사 이름 매칭을 시도할 최소 검색어 길이 (짧은 입력은 우연히 높은 점수가 나오기 쉬움)
+FUZZY_MIN_QUERY_LENGTH = 4
+
+
+@lru_cache(maxsize=4096)
+def normalize_name(name: str) -> str:
+    """
+    성분명을 검색 키로 정규화합니다.
+    
+    - NFKD 분해 후 결합 문자(악센트 등)를 제거하여 "é" → "e", 전각 문자 → 반각 문자로 변환
+    - NFC로 다시 조합하여 한글은 완성형 음절로 비교 (조합형/완성형 입력을 같은 키로 처리)
+    - 소문자 변환, 공백 제거
+    
+    분석 요청마다 같은 성분명이 반복되므로 결과를 캐시합니다.
+    
+    Args:
+        name: 성분명
+    
+    Returns:
+        정규화된 성분명
+    """
+    decomposed = unicodedata.normalize("NFKD", name.strip().lower())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize("NFC", stripped).replace(" ", "")
+
+
+def find_similar_name(query: str, names: Sequence[str]) -> Optional[int]:
+    """
+    오타/표기 차이를 허용하여 검색어와 가장 비슷한 이름을 찾습니다.
+    
+    이름 전체를 비교하는 rapidfuzz ratio를 사용하므로 짧은 검색어가 긴 이름의 일부와
+    우연히 일치하는 경우는 매칭하지 않습니다. rapidfuzz가 없으면 항상 None을 반환합니다.
+    
+    Args:
+        query: 정규화된 검색어
+        names: 정규화된 이름 목록
+    
+    Returns:
+        점수가 FUZZY_MATCH_CUTOFF 이상인 가장 비슷한 이름의 위치, 없으면 None
+    """
+    if process is None or len(query) < FUZZY_MIN_QUERY_LENGTH:
+        return None
+    match = process.extractOne(
+        query, names, scorer=fuzz.ratio, score_cutoff=FUZZY_MATCH_CUTOFF
+    )
+    return match[2] if match is not None else None
@@ -0,0 +1,124 @@
+"""
+ONNX 쿼리 임베딩 모듈
+INT8 동적 양자화된 ONNX MiniLM으로 CPU 단일 쿼리 임베딩을 계산
+
+모델 준비 (한 번만 실행):
+    optimum-cli export onnx --task feature-extraction --optimize O2 \\
+        --model sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2 mini_onnx/
+    optimum-cli onnxruntime quantize --avx512_vnni --onnx_model mini_onnx/ -o mini_onnx/
+"""
+
+import logging
+import os
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# 양자화 모델을 우선 사용하고, 없으면 FP32 ONNX 모델 사용
+ONNX_MODEL_FILES = ("model_quantized.onnx", "model.onnx")
+# 쿼리 최대 토큰 길이 (MiniLM 학습 시 최대 길이)
+ONNX_MAX_LENGTH = 128
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    ONNX Runtime 기반 임베딩 클래스
+
+    SentenceTransformer와 같은 방식(토큰 평균 풀링 + L2 정규화)으로 임베딩을 계산하여
+    SentenceTransformer로 만든 문서 임베딩과 같은 공간의 쿼리 벡터를 반환합니다.
+
+    Args:
+        model_dir: optimum으로 내보낸 ONNX 모델과 토크나이저가 있는 디렉토리
+        num_threads: ONNX Runtime 연산 스레드 수
+    """
+
+    def __init__(self, model_dir: str, num_threads: int = 1):
+        """
+        ONNX 세션과 토크나이저 초기화
+
+        Args:
+            model_dir: ONNX 모델 디렉토리
+            num_threads: ONNX Runtime 연산 스레드 수
+
+        Raises:
+            ImportError: onnxruntime 또는 transformers가 설치되지 않은 경우
+            FileNotFoundError: 디렉토리에 ONNX 모델 파일이 없는 경우
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = next(
+            (os.path.join(model_dir, name) for name in ONNX_MODEL_FILES
+             if os.path.exists(os.path.join(model_dir, name))),
+            None
+        )
+        if model_path is None:
+            raise FileNotFoundError(f"ONNX 모델 파일이 없습니다: {model_dir}")
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+        logger.info(f"⚡ ONNX 임베딩 모델 로드 완료: {os.path.basename(model_path)}")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """
+        텍스트를 임베딩합니다.
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            (N, d) L2 정규화된 FP32 임베딩 행렬
+        """
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=ONNX_MAX_LENGTH,
+            return_tensors="np"
+        )
+        feeds = {
+            name: encoded[name].astype(np.int64)
+            for name in ("input_ids", "attention_mask", "token_type_ids")
+            if name in self._input_names and name in encoded
+        }
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # 패딩 토큰을 제외한 평균 풀링
+        mask = feeds["attention_mask"][:, :, np.newaxis].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        norms = np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return (pooled / norms).astype(np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        문서 리스트를 임베딩합니다.
+
+        Args:
+            texts: 문서 텍스트 리스트
+
+        Returns:
+            임베딩 벡터 리스트
+        """
+        return self._encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        쿼리 하나를 임베딩합니다.
+
+        Args:
+            text: 쿼리 텍스트
+
+        Returns:
+            임베딩 벡터
+        """
+        return self._encode([text])[0].tolist()
@@ -0,0 +1,59 @@
+"""
+성분 전처리 모듈
+로드/조회 시점에 성분 행의 목록형 필드와 파생 필드를 한 번만 계산 (JSON 로더와 Supabase 캐시가 공유)
+"""
+
+from typing import Dict, List
+
+from rag.skin_type import CAUTION_SKIN_MASK, skin_type_mask
+
+# 목록형 성분 필드
+LIST_FIELDS = ("purpose", "good_for", "bad_for")
+# 미리 잘라둘 설명 길이 (100: 분석 주의 성분, 200: 벡터 검색 결과)
+DESCRIPTION_PREVIEW_LENGTHS = (100, 200)
+
+
+def _as_list(value) -> List[str]:
+    """목록형 필드 값을 문자열 리스트로 변환합니다 (None, 쉼표 구분 문자열 허용)."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    return [v.strip() for v in str(value).split(',') if v.strip()]
+
+
+def prepare_ingredient(item: Dict) -> Dict:
+    """
+    성분 항목의 목록형 필드를 미리 정규화합니다.
+    
+    로드 시점에 한 번만 계산하여 이후 검색/분석 경로에서
+    isinstance 분기, split, join을 반복하지 않도록 합니다.
+    
+    정규화 및 추가되는 필드:
+    - purpose, good_for, bad_for: 문자열 리스트로 변환 (None → [], 쉼표 구분 문자열 → 리스트)
+    - _<field>_str: 쉼표로 연결한 문자열 (purpose, good_for, bad_for 각각)
+    - _good_for_mask, _bad_for_mask: 피부 타입 비트마스크 (분석 시 정수 AND로 비교)
+    - _risky: 민감성/여드름성 피부에 주의가 필요한 성분인지 여부
+    - _description_100, _description_200: 해당 길이로 자른 설명 (잘린 경우 "..." 포함)
+    
+    Args:
+        item: 성분 정보 딕셔너리 (제자리에서 수정됨)
+    
+    Returns:
+        같은 딕셔너리 (이미 처리된 항목은 그대로 반환)
+    """
+    if "_purpose_str" in item:
+        return item
+    for field in LIST_FIELDS:
+        values = _as_list(item.get(field))
+        item[field] = values
+        item[f"_{field}_str"] = ', '.join(values)
+    item["_good_for_mask"] = skin_type_mask(item["good_for"])
+    item["_bad_for_mask"] = skin_type_mask(item["bad_for"])
+    item["_risky"] = bool(item["_bad_for_mask"] & CAUTION_SKIN_MASK)
+    description = item.get("description") or ""
+    for length in DESCRIPTION_PREVIEW_LENGTHS:
+        item[f"_description_{length}"] = (
+            description[:length] + "..." if len(description) > length else description
+        )
+    return item
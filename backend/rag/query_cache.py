@@ -0,0 +1,216 @@
+"""
+쿼리 캐시 모듈
+스레드 안전한 LRU + TTL 검색 결과 캐시와 임베딩 유사도 기반 캐시
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List
+
+import numpy as np
+
+
+class QueryCache:
+    """
+    LRU + TTL 쿼리 캐시 클래스
+
+    검색 결과를 키별로 보관하고, 가장 오래 사용하지 않은 항목부터 제거합니다.
+    저장 후 ttl초가 지난 항목은 조회 시 만료 처리됩니다.
+    스레드풀에서 동시에 호출되므로 모든 연산을 RLock으로 보호합니다.
+
+    Args:
+        maxsize: 최대 보관 항목 수
+        ttl: 항목 유효 시간 (초)
+    """
+
+    def __init__(self, maxsize: int = 2000, ttl: float = 300.0):
+        """
+        쿼리 캐시 초기화
+
+        Args:
+            maxsize: 최대 보관 항목 수
+            ttl: 항목 유효 시간 (초)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # 키 → (만료 시각, 값)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        캐시된 값을 조회합니다.
+
+        Args:
+            key: 캐시 키
+            default: 캐시에 없거나 만료된 경우 반환할 값
+
+        Returns:
+            캐시된 값 또는 default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        """
+        값을 캐시에 저장합니다.
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """캐시를 비웁니다 (데이터 갱신 시 호출)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            항목 수, 설정값, 적중/미스 횟수, 적중률 딕셔너리
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+class SemanticQueryCache:
+    """
+    유사도 기반 쿼리 캐시 클래스
+
+    쿼리 임베딩과 결과를 함께 보관하고, 새 쿼리 임베딩과의 코사인 유사도가
+    threshold 이상인 항목이 있으면 그 결과를 반환합니다.
+    ("히알루론산"과 "히알루론산(Sodium Hyaluronate)"처럼 표기만 다른 쿼리를 적중 처리)
+
+    임베딩은 (maxsize, d) 연속 행렬 하나에 보관하여 조회를 한 번의 행렬-벡터 곱으로 처리하고,
+    가득 차면 가장 오래 사용하지 않은 행을 덮어씁니다.
+
+    Args:
+        maxsize: 최대 보관 항목 수
+        threshold: 적중으로 판단할 최소 코사인 유사도
+    """
+
+    def __init__(self, maxsize: int = 2000, threshold: float = 0.92):
+        """
+        유사도 캐시 초기화
+
+        Args:
+            maxsize: 최대 보관 항목 수
+            threshold: 적중으로 판단할 최소 코사인 유사도
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._matrix = None  # 첫 저장 시 임베딩 차원에 맞춰 생성
+        self._tags = np.zeros(maxsize, dtype=np.int64)
+        self._last_used = np.zeros(maxsize, dtype=np.int64)
+        self._values: List[Any] = [None] * maxsize
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.RLock()
+
+    def get(self, embedding: np.ndarray, tag: int = 0, default: Any = None) -> Any:
+        """
+        유사한 쿼리의 캐시된 값을 조회합니다.
+
+        Args:
+            embedding: (d,) L2 정규화된 쿼리 임베딩
+            tag: 같은 값끼리만 비교할 구분값 (예: top_k)
+            default: 적중하지 않은 경우 반환할 값
+
+        Returns:
+            캐시된 값 또는 default
+        """
+        with self._lock:
+            if self._size:
+                scores = self._matrix[:self._size] @ embedding
+                scores[self._tags[:self._size] != tag] = -np.inf
+                row = int(np.argmax(scores))
+                if scores[row] >= self.threshold:
+                    self._tick += 1
+                    self._last_used[row] = self._tick
+                    self.hits += 1
+                    return self._values[row]
+            self.misses += 1
+            return default
+
+    def set(self, embedding: np.ndarray, value: Any, tag: int = 0):
+        """
+        쿼리 임베딩과 값을 저장합니다.
+
+        Args:
+            embedding: (d,) L2 정규화된 쿼리 임베딩
+            value: 저장할 값
+            tag: 구분값 (예: top_k)
+        """
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.maxsize, embedding.shape[0]), dtype=np.float32)
+            if self._size < self.maxsize:
+                row = self._size
+                self._size += 1
+            else:
+                row = int(np.argmin(self._last_used))
+            self._tick += 1
+            self._matrix[row] = embedding
+            self._tags[row] = tag
+            self._last_used[row] = self._tick
+            self._values[row] = value
+
+    def clear(self):
+        """캐시를 비웁니다 (데이터 갱신 시 호출)."""
+        with self._lock:
+            self._values = [None] * self.maxsize
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            항목 수, 설정값, 적중/미스 횟수, 적중률 딕셔너리
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": self._size,
+                "maxsize": self.maxsize,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
@@ -0,0 +1,96 @@
+"""
+피부 타입 모듈
+피부 타입 키워드를 비트마스크로 변환
+"""
+
+from typing import Iterable
+
+# 피부 타입 → 비트 (성분 데이터의 good_for/bad_for 어휘 + 사용자 입력 피부 타입)
+SKIN_TYPE_BITS = {
+    "dry": 1 << 0,
+    "oily": 1 << 1,
+    "sensitive": 1 << 2,
+    "acne": 1 << 3,
+    "combination": 1 << 4,
+    "normal": 1 << 5,
+    "irritated": 1 << 6,
+    "damaged": 1 << 7,
+    "acne-prone": 1 << 8,
+}
+
+# 한국어 피부 타입 → 영어 키워드
+SKIN_TYPE_ALIASES = {
+    "건성": "dry",
+    "지성": "oily",
+    "민감성": "sensitive",
+    "여드름성": "acne",
+    "여드름": "acne",
+    "복합성": "combination",
+    "중성": "normal",
+}
+
+
+def _build_normalize_skin():
+    """
+    고정된 피부 타입 어휘로 특화된 normalize_skin 함수를 생성합니다.
+
+    어휘가 닫혀 있으므로 모듈 로드 시 한 번 소스 코드를 생성하여 exec하고,
+    호출 시에는 별칭 딕셔너리와 비트 딕셔너리를 거치지 않고
+    상수 집합 포함 검사(if/elif 체인)만 수행합니다.
+
+    Returns:
+        피부 타입 키워드 하나를 비트로 변환하는 함수
+    """
+    keywords = {skin_type: {skin_type} for skin_type in SKIN_TYPE_BITS}
+    for alias, skin_type in SKIN_TYPE_ALIASES.items():
+        keywords[skin_type].add(alias)
+
+    lines = ["def normalize_skin(s):", "    s = s.strip().lower()"]
+    for skin_type, bit in SKIN_TYPE_BITS.items():
+        literal = ", ".join(repr(keyword) for keyword in sorted(keywords[skin_type]))
+        lines.append(f"    if s in {{{literal}}}: return {bit}")
+    lines.append("    return 0")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["normalize_skin"]
+
+
+# 피부 타입 키워드 하나 → 비트 (알 수 없는 키워드는 0)
+normalize_skin = _build_normalize_skin()
+
+
+def skin_type_mask(skin_types: Iterable[str]) -> int:
+    """
+    피부 타입 키워드 목록을 비트마스크로 변환합니다.
+
+    대소문자와 앞뒤 공백은 무시하고, 한국어 피부 타입은 영어 키워드로 변환합니다.
+    알 수 없는 키워드는 무시됩니다.
+
+    Args:
+        skin_types: 피부 타입 키워드 목록 (예: ["dry", "민감성"])
+
+    Returns:
+        피부 타입 비트마스크
+    """
+    mask = 0
+    for skin_type in skin_types:
+        mask |= normalize_skin(skin_type)
+    return mask
+
+
+def parse_skin_type(skin_type: str) -> int:
+    """
+    사용자 입력 피부 타입 문자열을 비트마스크로 변환합니다.
+
+    Args:
+        skin_type: 사용자 피부 타입 (예: "건성", "건성, 민감성")
+
+    Returns:
+        피부 타입 비트마스크
+    """
+    return skin_type_mask(skin_type.split(','))
+
+
+# 일반적으로 주의가 필요한 피부 타입 (민감성, 여드름성)
+CAUTION_SKIN_MASK = skin_type_mask(["sensitive", "acne"])
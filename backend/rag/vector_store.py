@@ -3,22 +3,137 @@
 ChromaDB 벡터 스토어 관리
 """
 
+import hashlib
 import logging
-from typing import List, Dict
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, Optional
 
+import chromadb
+import numpy as np
+import torch
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_community.embeddings import SentenceTransformerEmbeddings
 
+from rag.embedding_batcher import EmbeddingBatcher
+from rag.embedding_index import EmbeddingIndex
+from rag.onnx_embeddings import OnnxEmbeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 동작 (단일 워커 전용)
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# 청크 분할 기준 길이 (대부분의 성분 문서는 이보다 짧아 분할하지 않음)
+CHUNK_SIZE = 1000
+
+# 문서 본문 템플릿: (라벨, 성분 필드, 최대 길이) - 값이 비어 있는 필드는 생략
+CONTENT_TEMPLATE = (
+    ("한국어 성분명: ", "kor_name", None),
+    ("영어 성분명: ", "eng_name", None),
+    ("설명: ", "description", 500),
+    ("목적: ", "_purpose_str", None),
+    ("권장 피부 타입: ", "_good_for_str", None),
+    ("주의 피부 타입: ", "_bad_for_str", None),
+)
+
+# 임베딩 모델 설정
+EMBEDDING_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+EMBEDDING_BATCH_SIZE = 128
+# 검색 인덱스 저장 정밀도 ("bf16", "int8", "fp32")
+EMBEDDING_PRECISION = os.getenv("EMBEDDING_PRECISION", "int8")
+# 저장된 임베딩이 현재 문서/모델로 만들어졌는지 확인하는 지문 파일 (persist_directory 내부)
+FINGERPRINT_FILE = ".fingerprint"
+# 여러 워커가 동시에 임베딩/upsert하지 않도록 잡는 잠금 파일 (persist_directory 내부)
+LOCK_FILE = ".build.lock"
+# CPU 추론 스레드 수 (멀티 워커 실행 시 코어 과다 할당 방지)
+EMBEDDING_NUM_THREADS = min(4, os.cpu_count() or 1)
+# 쿼리 임베딩용 INT8 ONNX 모델 디렉토리 (선택, 설정 시 쿼리만 ONNX Runtime으로 임베딩)
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR")
+
+# 전역 임베딩 모델 (싱글톤, 프로세스당 한 번만 로드)
+_shared_embeddings: Optional[SentenceTransformerEmbeddings] = None
+_shared_query_embeddings = None
+_embeddings_lock = threading.Lock()
+_query_embeddings_lock = threading.Lock()
+
+
+def get_embeddings() -> SentenceTransformerEmbeddings:
+    """
+    임베딩 모델 싱글톤 반환
+    
+    VectorStore/EnterpriseRAG를 여러 번 생성해도 모델 가중치는 한 번만 로드합니다.
+    
+    Returns:
+        SentenceTransformerEmbeddings 인스턴스
+    """
+    global _shared_embeddings
+    
+    if _shared_embeddings is None:
+        with _embeddings_lock:
+            if _shared_embeddings is None:
+                # 콜드 스타트 임베딩은 큰 배치로 한 번에 인코딩 (GPU가 있으면 GPU 사용)
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                if device == "cpu":
+                    torch.set_num_threads(EMBEDDING_NUM_THREADS)
+                logger.info(f"🧠 임베딩 디바이스: {device}, 배치 크기: {EMBEDDING_BATCH_SIZE}")
+                
+                _shared_embeddings = SentenceTransformerEmbeddings(
+                    model_name=EMBEDDING_MODEL_NAME,
+                    model_kwargs={"device": device},
+                    encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE}
+                )
+                logger.info("✅ 임베딩 모델 로드 완료")
+    
+    return _shared_embeddings
+
+
+def get_query_embeddings():
+    """
+    쿼리 임베딩 모델 싱글톤 반환
+    
+    EMBEDDING_ONNX_DIR이 설정되어 있으면 INT8 양자화 ONNX 모델(OnnxEmbeddings)을 사용하고,
+    설정되지 않았거나 로드에 실패하면 문서 임베딩과 같은 SentenceTransformer 모델을 사용합니다.
+    문서 임베딩은 항상 SentenceTransformer로 계산합니다.
+    
+    Returns:
+        embed_query를 제공하는 임베딩 인스턴스
+    """
+    global _shared_query_embeddings
+    
+    if _shared_query_embeddings is None:
+        with _query_embeddings_lock:
+            if _shared_query_embeddings is None:
+                query_embeddings = None
+                if EMBEDDING_ONNX_DIR:
+                    try:
+                        # 단일 쿼리 추론은 스레드를 늘려도 이득이 적으므로 1개만 사용
+                        query_embeddings = OnnxEmbeddings(EMBEDDING_ONNX_DIR, num_threads=1)
+                    except ImportError:
+                        logger.warning("⚠️ onnxruntime 패키지가 설치되지 않았습니다. SentenceTransformer로 쿼리 임베딩")
+                    except Exception as e:
+                        logger.error(f"❌ ONNX 임베딩 모델 로드 실패, SentenceTransformer로 쿼리 임베딩: {e}", exc_info=True)
+                _shared_query_embeddings = query_embeddings or get_embeddings()
+    
+    return _shared_query_embeddings
+
 
 class VectorStore:
     """
     ChromaDB 벡터 스토어 관리 클래스
     
     성분 정보를 임베딩하여 벡터 스토어에 저장하고 검색합니다.
+    ChromaDB는 임베딩 저장소로 사용하고, 검색은 양자화된
+    인메모리 인덱스(EmbeddingIndex, 기본 INT8)에서 수행합니다.
+    
+    임베딩 모델 로드와 벡터 스토어 생성은 처음 필요할 때(`ensure_vectorstore`) 수행하므로,
+    벡터 검색을 쓰지 않는 Supabase 경로에서는 임베딩 비용이 들지 않습니다.
     """
     
     def __init__(self, ingredients_data: List[Dict], persist_directory: str = "./chroma_db_ingredients"):
@@ -30,12 +145,38 @@ class VectorStore:
             persist_directory: ChromaDB 벡터 스토어 저장 디렉토리
         """
         self.ingredients_data = ingredients_data
+        # 문서 메타데이터의 id → 전체 성분 정보 (메타데이터에는 id와 이름만 저장)
+        self._ingredient_by_id: List[Dict] = ingredients_data
         self.persist_directory = persist_directory
         self.text_splitter = None
         self.embeddings = None
+        self.query_embeddings = None
+        self.query_batcher = None
         self.vectorstore = None
-        self.retriever = None
-        self._initialize()
+        self.index = None
+        # 쿼리 임베딩 캐시 (동일/정규화 시 같은 쿼리는 재인코딩하지 않음)
+        # 캐시 미스는 배처를 거쳐 동시 요청과 함께 인코딩
+        self._embed_query_cached = lru_cache(maxsize=2048)(
+            lambda q: tuple(self.query_batcher.embed(q))
+        )
+        # 지연 초기화 상태 (첫 호출 경쟁을 Lock으로 방지)
+        self._ready = False
+        self._init_lock = threading.Lock()
+    
+    def ensure_vectorstore(self):
+        """
+        벡터 스토어가 초기화되어 있지 않으면 초기화합니다.
+        
+        여러 스레드가 동시에 호출해도 초기화는 한 번만 수행됩니다.
+        초기화에 실패하면 예외가 전파되고, 다음 호출에서 다시 시도합니다.
+        """
+        if self._ready:
+            return
+        with self._init_lock:
+            if self._ready:
+                return
+            self._initialize()
+            self._ready = True
     
     def _initialize(self):
         """
@@ -43,19 +184,19 @@ class VectorStore:
         
         초기화 과정:
         1. LangChain 컴포넌트 초기화
-        2. 문서 생성 및 청크 분할
-        3. ChromaDB에 저장
-        4. Retriever 생성
+        2. 문서 생성 (긴 문서만 청크 분할)
+        3. 문서 일괄 임베딩 후 ChromaDB에 저장
+        4. 양자화 검색 인덱스 생성 (검색은 Chroma/LangChain retriever를 거치지 않음)
         """
         logger.info("🔧 LangChain 컴포넌트 초기화 중...")
         
         self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=200
+            chunk_size=CHUNK_SIZE, chunk_overlap=200
         )
         
-        self.embeddings = SentenceTransformerEmbeddings(
-            model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
-        )
+        self.embeddings = get_embeddings()
+        self.query_embeddings = get_query_embeddings()
+        self.query_batcher = EmbeddingBatcher(self.query_embeddings)
         
         logger.info("🗄️ ChromaDB 벡터 스토어 생성 중...")
         self._create_vectorstore()
@@ -65,73 +206,229 @@ class VectorStore:
         """
         ChromaDB 벡터 스토어를 생성합니다.
         
-        각 성분 정보를 Document로 변환하여 벡터 스토어에 저장합니다.
+        각 성분 정보를 Document로 변환하여 일괄 임베딩한 뒤 벡터 스토어에 저장합니다.
+        본문은 CONTENT_TEMPLATE으로 만들며, 목록형 필드는 DataLoader에서
+        미리 평탄화된 `_<field>_str` 값을 사용합니다.
+        
+        메타데이터에는 id와 성분명만 저장하여 Chroma 행 크기를 줄이고,
+        설명 등 상세 정보는 검색 시 id로 `_ingredient_by_id`에서 조회합니다.
         """
-        documents = []
-        for item in self.ingredients_data:
-            kor_name = item.get('kor_name', '')
-            eng_name = item.get('eng_name', '')
-            description = item.get('description', '')
-            purpose = item.get('purpose', [])
-            good_for = item.get('good_for', [])
-            bad_for = item.get('bad_for', [])
+        split_docs = []
+        doc_ids = []
+        for i, item in enumerate(self.ingredients_data):
+            content = "\n".join(
+                f"{label}{item[field][:limit]}"
+                for label, field, limit in CONTENT_TEMPLATE
+                if item.get(field)
+            )
             
-            content_parts = []
-            if kor_name:
-                content_parts.append(f"한국어 성분명: {kor_name}")
-            if eng_name:
-                content_parts.append(f"영어 성분명: {eng_name}")
-            if description:
-                content_parts.append(f"설명: {description[:500]}")
-            if purpose:
-                content_parts.append(f"목적: {', '.join(purpose) if isinstance(purpose, list) else purpose}")
-            if good_for:
-                content_parts.append(f"권장 피부 타입: {', '.join(good_for) if isinstance(good_for, list) else good_for}")
-            if bad_for:
-                content_parts.append(f"주의 피부 타입: {', '.join(bad_for) if isinstance(bad_for, list) else bad_for}")
+            metadata = {
+                "id": i,
+                "ingredient_kor": item.get('kor_name', ''),
+                "ingredient_eng": item.get('eng_name', '')
+            }
             
-            content = "\n".join(content_parts)
+            # 문서 대부분은 chunk_size보다 짧으므로 분할기를 거치지 않음
+            if len(content) > CHUNK_SIZE:
+                for j, chunk in enumerate(self.text_splitter.split_text(content)):
+                    split_docs.append(Document(page_content=chunk, metadata=dict(metadata)))
+                    doc_ids.append(f"{i}-{j}")
+            else:
+                split_docs.append(Document(page_content=content, metadata=metadata))
+                doc_ids.append(str(i))
+        
+        logger.info(f"📄 {len(self.ingredients_data)}개 성분에서 {len(split_docs)}개 문서 생성")
+        
+        # 디스크 기반 PersistentClient를 명시적으로 사용하여 여러 워커가 같은 디렉토리를 공유
+        client = chromadb.PersistentClient(path=self.persist_directory)
+        self.vectorstore = Chroma(client=client, embedding_function=self.embeddings)
+        
+        if not split_docs:
+            logger.warning("⚠️ 임베딩할 문서가 없습니다")
+            return
+        
+        texts = [doc.page_content for doc in split_docs]
+        metadatas = [doc.metadata for doc in split_docs]
+        fingerprint = self._fingerprint(doc_ids, texts)
+        
+        # 잠금을 잡은 워커 하나만 임베딩/upsert하고, 나머지는 기다렸다가 저장된 임베딩을 재사용
+        with self._build_lock():
+            # 지문이 같으면 저장된 임베딩을 재사용하여 재시작 시 재임베딩 생략
+            embeddings = self._load_persisted_embeddings(doc_ids, fingerprint)
+            if embeddings is not None:
+                logger.info("♻️ 저장된 ChromaDB 임베딩 재사용 (문서 변경 없음)")
+            else:
+                embeddings = self._embed_documents(texts)
+                
+                # 미리 계산한 임베딩을 고정 id로 upsert (Chroma가 다시 임베딩하지 않음)
+                # 재시작 시 같은 문서가 중복 저장되지 않음
+                self.vectorstore._collection.upsert(
+                    ids=doc_ids,
+                    embeddings=embeddings.tolist(),
+                    documents=texts,
+                    metadatas=metadatas
+                )
+                self._write_fingerprint(fingerprint)
+                logger.info("✅ ChromaDB 벡터 스토어 생성 완료")
+        
+        self._build_index(embeddings, [metadata["id"] for metadata in metadatas])
+    
+    @contextmanager
+    def _build_lock(self):
+        """
+        persist_directory의 잠금 파일로 프로세스 간 배타 잠금을 잡습니다.
+        
+        여러 uvicorn 워커가 같은 디렉토리에 동시에 임베딩을 upsert하거나
+        지문 파일을 쓰지 않도록 합니다. fcntl이 없는 환경에서는 잠금 없이 진행합니다.
+        """
+        os.makedirs(self.persist_directory, exist_ok=True)
+        with open(os.path.join(self.persist_directory, LOCK_FILE), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _fingerprint(doc_ids: List[str], texts: List[str]) -> str:
+        """
+        임베딩 모델과 문서 id/본문으로 지문을 계산합니다.
+        
+        Args:
+            doc_ids: 문서 id 리스트
+            texts: 문서 본문 리스트
+        
+        Returns:
+            blake2b 16진수 문자열
+        """
+        digest = hashlib.blake2b(EMBEDDING_MODEL_NAME.encode("utf-8"), digest_size=32)
+        for doc_id, text in zip(doc_ids, texts):
+            digest.update(b"\0" + doc_id.encode("utf-8") + b"\0" + text.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _load_persisted_embeddings(self, doc_ids: List[str], fingerprint: str) -> Optional[np.ndarray]:
+        """
+        지문이 일치하면 ChromaDB에 저장된 문서 임베딩을 불러옵니다.
+        
+        Args:
+            doc_ids: 문서 id 리스트
+            fingerprint: 현재 문서의 지문
+        
+        Returns:
+            doc_ids 순서의 (N, d) 임베딩 행렬, 재사용할 수 없으면 None
+        """
+        fingerprint_path = os.path.join(self.persist_directory, FINGERPRINT_FILE)
+        try:
+            with open(fingerprint_path, "r", encoding="utf-8") as f:
+                if f.read().strip() != fingerprint:
+                    return None
             
-            doc = Document(
-                page_content=content,
-                metadata={
-                    "ingredient_kor": kor_name,
-                    "ingredient_eng": eng_name,
-                    "description": (description[:200] + "..." if description and len(description) > 200 else description) or '',
-                    "purpose": ', '.join(purpose) if isinstance(purpose, list) else (purpose or ''),
-                    "good_for": ', '.join(good_for) if isinstance(good_for, list) else (good_for or ''),
-                    "bad_for": ', '.join(bad_for) if isinstance(bad_for, list) else (bad_for or '')
-                }
-            )
-            documents.append(doc)
+            stored = self.vectorstore._collection.get(ids=doc_ids, include=["embeddings"])
+            embedding_by_id = dict(zip(stored["ids"], stored["embeddings"]))
+            if len(embedding_by_id) != len(doc_ids):
+                return None
+            return np.asarray([embedding_by_id[doc_id] for doc_id in doc_ids], dtype=np.float32)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ 저장된 임베딩을 불러오지 못해 다시 생성합니다: {e}")
+            return None
+    
+    def _write_fingerprint(self, fingerprint: str):
+        """
+        현재 문서의 지문을 persist_directory에 기록합니다.
         
-        split_docs = self.text_splitter.split_documents(documents)
-        logger.info(f"📄 {len(documents)}개 문서를 {len(split_docs)}개 청크로 분할")
+        Args:
+            fingerprint: 현재 문서의 지문
+        """
+        fingerprint_path = os.path.join(self.persist_directory, FINGERPRINT_FILE)
+        try:
+            # 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 절반만 쓰인 지문을 보지 않도록 함
+            tmp_path = f"{fingerprint_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(fingerprint)
+            os.replace(tmp_path, fingerprint_path)
+        except IOError as e:
+            logger.error(f"❌ 임베딩 지문 저장 실패: {e}", exc_info=True)
+    
+    def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        문서를 큰 배치로 한 번에 임베딩합니다.
         
-        self.vectorstore = Chroma.from_documents(
-            documents=split_docs,
-            embedding=self.embeddings,
-            persist_directory=self.persist_directory
-        )
+        LangChain 래퍼를 거치지 않고 SentenceTransformer를 직접 호출하여
+        numpy 행렬로 받고, 추론 모드에서 autograd 기록 없이 실행합니다.
+        
+        Args:
+            texts: 임베딩할 문서 텍스트 리스트
         
-        self.retriever = self.vectorstore.as_retriever(search_kwargs={"k": 3})
-        logger.info("✅ ChromaDB 벡터 스토어 생성 완료")
+        Returns:
+            (N, d) L2 정규화된 FP32 임베딩 행렬
+        """
+        with torch.inference_mode():
+            embeddings = self.embeddings.client.encode(
+                texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        return np.asarray(embeddings, dtype=np.float32)
     
-    def search(self, query: str, top_k: int = 3) -> List[Document]:
+    def _build_index(self, embeddings: np.ndarray, ids: List[int]):
         """
-        벡터 검색을 수행합니다.
+        문서 임베딩으로 양자화 검색 인덱스를 생성합니다.
+        
+        Args:
+            embeddings: (N, d) 문서 임베딩 행렬
+            ids: 각 행에 대응하는 성분 id 리스트
+        """
+        self.index = EmbeddingIndex(embeddings, ids, precision=EMBEDDING_PRECISION)
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        쿼리 임베딩을 계산합니다.
+        
+        임베딩은 `query.strip().lower()` 기준으로 LRU 캐시되어
+        반복 쿼리는 임베딩 모델을 다시 호출하지 않습니다.
         
         Args:
             query: 검색 쿼리
+        
+        Returns:
+            (d,) L2 정규화된 쿼리 임베딩
+        """
+        self.ensure_vectorstore()
+        embedding = np.asarray(self._embed_query_cached(query.strip().lower()), dtype=np.float32)
+        return embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+    
+    def search_by_vector(self, embedding: np.ndarray, top_k: int = 3) -> List[Dict]:
+        """
+        쿼리 임베딩으로 벡터 검색을 수행합니다.
+        
+        Args:
+            embedding: (d,) 쿼리 임베딩
             top_k: 반환할 최대 결과 개수
         
         Returns:
-            검색 결과 Document 리스트
+            검색된 성분 정보 딕셔너리 리스트 (유사도 순)
         """
-        if self.retriever is None:
+        self.ensure_vectorstore()
+        if self.index is None:
             return []
         
-        # top_k 동적 변경
-        self.retriever.search_kwargs["k"] = top_k
-        return self.retriever.invoke(query)
-
+        return [self._ingredient_by_id[i] for i in self.index.search(embedding, top_k)]
+    
+    def search(self, query: str, top_k: int = 3) -> List[Dict]:
+        """
+        벡터 검색을 수행합니다.
+        
+        Args:
+            query: 검색 쿼리
+            top_k: 반환할 최대 결과 개수
+        
+        Returns:
+            검색된 성분 정보 딕셔너리 리스트 (유사도 순)
+        """
+        return self.search_by_vector(self.embed_query(query), top_k)
@@ -9,8 +9,10 @@
 - llm/: LLM 관련 클래스
 """
 
+import asyncio
 import os
 import logging
+from contextlib import asynccontextmanager
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,6 +24,8 @@ logger = logging.getLogger(__name__)
 # FastAPI 관련 imports
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 # RAG 시스템
 from rag.enterprise_rag import EnterpriseRAG
@@ -29,11 +33,58 @@ from rag.enterprise_rag import EnterpriseRAG
 # API 라우터
 from api.routes import setup_routes
 
+# 유휴 채팅 세션 정리 주기 (초)
+SESSION_EVICTION_INTERVAL = int(os.getenv("SESSION_EVICTION_INTERVAL", 300))
+
+
+def resolve_worker_count() -> int:
+    """
+    uvicorn 워커 수를 결정합니다.
+    
+    환경변수 WEB_CONCURRENCY로 명시한 경우에만 여러 워커를 사용합니다.
+    인메모리 채팅 세션은 워커 간에 공유되지 않으므로 REDIS_URL 없이
+    2개 이상을 요청하면 단일 워커로 실행합니다.
+    
+    Returns:
+        워커 수 (기본값: 1)
+    """
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+    if workers > 1 and not os.getenv("REDIS_URL"):
+        logger.error(
+            f"❌ WEB_CONCURRENCY={workers}는 REDIS_URL 없이 사용할 수 없습니다 "
+            "(워커 간 채팅 세션 공유 불가). 단일 워커로 실행합니다."
+        )
+        return 1
+    return workers
+
+
+async def evict_idle_sessions_periodically():
+    """주기적으로 유휴 채팅 세션을 삭제하는 백그라운드 작업"""
+    while True:
+        await asyncio.sleep(SESSION_EVICTION_INTERVAL)
+        try:
+            evicted = rag_system.conversation_manager.evict_idle_sessions()
+            if evicted:
+                logger.info(f"🧹 유휴 채팅 세션 {evicted}개 삭제")
+        except Exception as e:
+            logger.error(f"❌ 유휴 세션 정리 오류: {e}", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 주기 (시작 시 백그라운드 작업 등록, 종료 시 취소)"""
+    eviction_task = asyncio.create_task(evict_idle_sessions_periodically())
+    yield
+    eviction_task.cancel()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="화장품 성분 RAG API (Supabase)",
     description="PostgreSQL + ChromaDB 하이브리드 RAG 시스템",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=ORJSONResponse,  # orjson으로 JSON 직렬화
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -56,15 +107,25 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],  # 필요한 헤더만 허용
 )
 
+# 응답 압축 (/ingredients 목록, /analyze_product 리포트 등 1KB 이상 응답만)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # RAG 시스템 초기화
-logger.info("🚀 RAG 시스템 초기화 시작...")
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 ingredients_file = os.path.join(project_root, 'app', 'src', 'main', 'assets', 'ingredients.json')
-rag_system = EnterpriseRAG(ingredients_file)
+WORKERS = resolve_worker_count()
 
-# 라우트 등록
-setup_routes(app, rag_system)
+if __name__ == '__main__' and WORKERS > 1:
+    # 멀티 워커 실행 시 이 프로세스는 워커를 띄우는 감독 역할만 하므로 RAG 시스템을 만들지 않음
+    # (각 워커가 모듈을 다시 import하여 자신의 RAG 시스템을 초기화)
+    rag_system = None
+else:
+    logger.info("🚀 RAG 시스템 초기화 시작...")
+    rag_system = EnterpriseRAG(ingredients_file)
+    
+    # 라우트 등록
+    setup_routes(app, rag_system)
 
 if __name__ == '__main__':
     import uvicorn
@@ -72,9 +133,25 @@ if __name__ == '__main__':
     logger.info("=" * 60)
     logger.info("🚀 화장품 성분 RAG 서버 (Supabase 버전)")
     logger.info("=" * 60)
-    logger.info(f"📊 데이터 소스: {rag_system.get_data_source()}")
-    logger.info(f"📦 성분 개수: {rag_system.get_ingredients_count()}")
+    if rag_system is not None:
+        logger.info(f"📊 데이터 소스: {rag_system.get_data_source()}")
+        logger.info(f"📦 성분 개수: {rag_system.get_ingredients_count()}")
     logger.info("📚 API 문서: http://localhost:5000/docs")
     logger.info("=" * 60)
     
-    uvicorn.run(app, host="0.0.0.0", port=5000, log_level="info")
+    # 워커 수 (환경변수 WEB_CONCURRENCY, 기본값: 1, 2 이상은 REDIS_URL 필요)
+    # 워커마다 RAG 시스템을 따로 초기화하며, ChromaDB는 같은 디스크 디렉토리를 공유
+    # (벡터 스토어 생성은 파일 잠금으로 한 워커만 수행)
+    logger.info(f"🔧 워커 수: {WORKERS}")
+    
+    # uvloop 이벤트 루프 + httptools HTTP 파서 (uvicorn[standard]에 포함)
+    # 멀티 워커는 import 문자열로만 실행 가능, 단일 워커는 이미 초기화된 app을 그대로 사용
+    uvicorn.run(
+        "rag_server_supabase:app" if WORKERS > 1 else app,
+        host="0.0.0.0",
+        port=5000,
+        workers=WORKERS,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
+    )
@@ -13,22 +13,9 @@ if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
-# CPU 코어 수 확인
-if [[ "$OSTYPE" == "darwin"* ]]; then
-    # macOS
-    WORKERS=$(sysctl -n hw.ncpu)
-elif [[ "$OSTYPE" == "linux-gnu"* ]]; then
-    # Linux
-    WORKERS=$(nproc)
-else
-    # 기본값
-    WORKERS=4
-fi
-
-# 워커 수 계산 (코어 수 * 2 + 1)
-WORKERS=$((WORKERS * 2 + 1))
-
-echo "🔧 워커 수: $WORKERS"
+# 워커 수는 환경변수 WEB_CONCURRENCY로 지정 (기본값: 1)
+# 2 이상은 REDIS_URL이 필요하며, 없으면 서버가 단일 워커로 실행 (워커 간 채팅 세션 공유 불가)
+echo "🔧 워커 수 (WEB_CONCURRENCY): ${WEB_CONCURRENCY:-1}"
 echo "📚 의존성 확인 중..."
 pip install -q -r requirements.txt
 
@@ -37,6 +24,5 @@ echo "📱 서버 주소: http://0.0.0.0:5000"
 echo "📚 API 문서: http://localhost:5000/docs"
 echo ""
 
-# 프로덕션 모드 (멀티 워커)
-uvicorn rag_server_fastapi:app --host 0.0.0.0 --port 5000 --workers $WORKERS
-
+# 프로덕션 모드 (워커 수 검사와 uvloop/httptools 설정은 rag_server_supabase.py에서 처리)
+exec python rag_server_supabase.py
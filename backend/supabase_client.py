@@ -5,10 +5,21 @@ PostgreSQL 데이터베이스 연결 및 쿼리 함수
 
 import logging
 import os
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Optional, Any, Iterator, Mapping, Set, Tuple
+
+import httpx
+import orjson
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from rag.normalize import find_similar_name, normalize_name
+from rag.prepare import prepare_ingredient
+from rag.query_cache import QueryCache
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -23,9 +34,44 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# 전체 조회 페이지 크기 (PostgREST 기본 최대 행 수 1000 이하)
+PAGE_SIZE = 500
+# 일괄 이름 조회 시 IN 쿼리 하나에 넣을 최대 이름 수 (URL 길이 제한 고려)
+IN_QUERY_CHUNK_SIZE = 100
+
+# 부분 매칭 검색어 최소 길이 (와일드카드 제거 후, "물"처럼 한 글자 성분명 허용)
+SEARCH_MIN_QUERY_LENGTH = 1
+# 단건 이름 조회 시 받을 최대 행 수 (한국어/영어 이름이 각각 다른 행에 일치하는 경우 대비)
+NAME_LOOKUP_LIMIT = 10
+
+# PostgREST 직접 호출 타임아웃 (초)
+REST_REQUEST_TIMEOUT_SECONDS = 10.0
+
+# 이름/피부 타입 인덱스 캐시에 받을 컬럼 (전체 컬럼은 매칭된 성분만 조회)
+INDEX_COLUMNS = "id,kor_name,eng_name,good_for,bad_for"
+# 피부 타입 인덱스를 만드는 배열 컬럼
+SKIN_TYPE_FIELDS = ("good_for", "bad_for")
+# 성분 테이블 프로세스 내 캐시 유효 시간 (초)
+INGREDIENTS_CACHE_TTL_SECONDS = int(os.getenv("INGREDIENTS_CACHE_TTL", 300))
+# 단건 이름 조회/피부 타입별 조회 결과 캐시 최대 항목 수
+LOOKUP_CACHE_SIZE = 1024
+
 # 전역 클라이언트 (싱글톤)
 _supabase_client: Optional[Client] = None
 
+# 전역 PostgREST 직접 호출 클라이언트 (싱글톤)
+_rest_client: Optional[httpx.Client] = None
+_rest_client_lock = threading.Lock()
+
+# 전역 성분 이름 인덱스 캐시 (_IngredientCache)
+_ingredients_cache = None
+_ingredients_cache_lock = threading.Lock()
+
+# 단건 이름 조회/피부 타입별 조회 결과 캐시
+_lookup_cache = QueryCache(maxsize=LOOKUP_CACHE_SIZE, ttl=INGREDIENTS_CACHE_TTL_SECONDS)
+# 캐시 미스 표시 (결과 없음(None)도 캐시하므로 별도 객체 사용)
+_MISS = object()
+
 
 def get_supabase_client() -> Optional[Client]:
     """Supabase 클라이언트 싱글톤 반환"""
@@ -55,138 +101,621 @@ def is_supabase_available() -> bool:
 # 성분 검색 함수들
 # ============================================================
 
-def get_ingredient_by_name(name: str) -> Optional[Dict]:
-    """성분명으로 정확한 매칭 검색"""
+def get_ingredient_by_name(name: str) -> Optional[Mapping]:
+    """
+    성분명으로 정확한 매칭 검색
+    
+    결과(없음 포함)는 이름별로 TTL 캐시되며, 캐시된 행은 읽기 전용 매핑(MappingProxyType)으로
+    반환하므로 복사 없이 공유합니다. 수정이 필요하면 호출자가 dict()로 복사해야 합니다.
+    
+    Args:
+        name: 성분명
+    
+    Returns:
+        읽기 전용 성분 정보 매핑, 없으면 None
+    """
     client = get_supabase_client()
     if not client:
         return None
     
-    try:
-        # 한국어 이름으로 검색
-        result = client.table("ingredients") \
-            .select("*") \
-            .ilike("kor_name", name.strip()) \
-            .limit(1) \
-            .execute()
-        
-        if result.data:
-            return result.data[0]
-        
-        # 영어 이름으로 검색
-        result = client.table("ingredients") \
-            .select("*") \
-            .ilike("eng_name", name.strip()) \
-            .limit(1) \
-            .execute()
-        
-        if result.data:
-            return result.data[0]
-        
-        return None
-    except Exception as e:
-        logger.error(f"❌ 성분 검색 오류: {e}", exc_info=True)
-        return None
+    cache_key = ("name", name.strip().lower())
+    item = _lookup_cache.get(cache_key, _MISS)
+    if item is _MISS:
+        try:
+            item = _fetch_ingredient_by_name(client, name)
+        except Exception as e:
+            logger.error(f"❌ 성분 검색 오류: {e}", exc_info=True)
+            return None
+        item = _freeze(item) if item is not None else None
+        _lookup_cache.set(cache_key, item)
+    
+    return item
+
+
+def _freeze(item: Mapping) -> Mapping:
+    """
+    캐시에 보관할 행을 한 번 전처리(prepare_ingredient)한 뒤 읽기 전용 매핑으로 감쌉니다.
+    
+    이미 감싼 행은 그대로 반환하므로 캐시 행의 전처리는 행마다 한 번만 수행됩니다.
+    """
+    if isinstance(item, MappingProxyType):
+        return item
+    return MappingProxyType(prepare_ingredient(item))
+
+
+def _fetch_ingredient_by_name(client: Client, name: str) -> Optional[Mapping]:
+    """성분명 정확한 매칭 조회 (이름 인덱스 캐시가 유효하면 캐시로 매칭)"""
+    cache = _get_fresh_cache()
+    if cache is not None:
+        item = cache.match_exact(normalize_name(name))
+        if item is None:
+            return None
+        return cache.hydrate(client, [item["id"]]).get(item["id"])
+    
+    stripped = name.strip()
+    
+    # 한국어/영어 이름을 한 번의 요청으로 검색 (한국어 이름 일치를 우선)
+    value = _quote_filter_value(stripped)
+    result = client.table("ingredients") \
+        .select("*") \
+        .or_(f"kor_name.ilike.{value},eng_name.ilike.{value}") \
+        .limit(NAME_LOOKUP_LIMIT) \
+        .execute()
+    
+    rows = result.data or []
+    lowered = stripped.lower()
+    for item in rows:
+        if (item.get('kor_name') or '').lower() == lowered:
+            return item
+    return rows[0] if rows else None
 
 
 def search_ingredients(query: str, limit: int = 10) -> List[Dict]:
-    """성분명 부분 매칭 검색"""
+    """
+    성분명 부분 매칭 검색
+    
+    검색어의 와일드카드(%, *)는 제거하고 필터 값은 인용하여, 쉼표/괄호가 필터 구문을 깨거나
+    `%%%`처럼 모든 행과 일치하는 패턴이 만들어지지 않도록 합니다.
+    
+    Args:
+        query: 검색어
+        limit: 최대 결과 개수
+    
+    Returns:
+        성분 정보 딕셔너리 리스트 (검색어가 너무 짧으면 빈 리스트)
+    
+    Raises:
+        RuntimeError: Supabase 클라이언트를 사용할 수 없는 경우
+        Exception: 데이터베이스 오류 발생 시 (호출자가 "결과 없음"과 구분하여 캐시하지 않도록 전파)
+    """
     client = get_supabase_client()
     if not client:
+        raise RuntimeError("Supabase 클라이언트를 사용할 수 없습니다")
+    
+    sanitized = query.replace("%", "").replace("*", "").strip()
+    if len(sanitized) < SEARCH_MIN_QUERY_LENGTH:
         return []
+    pattern = _quote_filter_value(f"%{sanitized}%")
     
     try:
         result = client.table("ingredients") \
             .select("*") \
-            .or_(f"kor_name.ilike.%{query}%,eng_name.ilike.%{query}%") \
+            .or_(f"kor_name.ilike.{pattern},eng_name.ilike.{pattern}") \
             .limit(limit) \
             .execute()
         
         return result.data if result.data else []
     except Exception as e:
         logger.error(f"❌ 성분 검색 오류: {e}", exc_info=True)
-        return []
+        raise
 
 
-def get_ingredients_by_names(names: List[str]) -> Dict[str, Dict]:
+def _quote_filter_value(value: str) -> str:
+    """PostgREST 필터 값 인용 (쉼표, 괄호 등이 포함된 성분명 처리)"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _index_by_name(rows: List[Dict]):
+    """성분 목록을 정규화된 한국어/영어 이름으로 인덱싱"""
+    kor_index = {normalize_name(item['kor_name']): item for item in rows if item.get('kor_name')}
+    eng_index = {normalize_name(item['eng_name']): item for item in rows if item.get('eng_name')}
+    return kor_index, eng_index
+
+
+def _trigrams(text: str) -> Set[str]:
+    """문자열의 3-gram 집합"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _TrigramIndex:
     """
-    여러 성분명으로 일괄 검색 (성능 최적화)
+    정규화된 이름의 부분 문자열 매칭용 3-gram 역색인 (+ rapidfuzz 유사 이름 매칭)
     
-    효율성 개선:
-    - 모든 성분을 한 번에 조회하여 네트워크 호출 최소화
-    - 메모리에서 인덱싱하여 O(1) 검색
+    부분 매칭 조건 `query in key or key in query`를 전체 이름 순회 없이 처리합니다.
+    두 경우 모두 key는 query와 3-gram을 하나 이상 공유하므로, query의 3-gram 포스팅 리스트
+    합집합만 후보로 삼아 실제 부분 문자열 검사를 하고, 여러 개면 인덱스 순서상 가장 앞선 이름을 반환합니다
+    (기존 선형 탐색과 같은 결과). 3글자 미만 이름/쿼리는 3-gram이 없으므로 별도로 검사합니다.
+    
+    Args:
+        index: 정규화된 이름 → 성분 정보 딕셔너리
+    """
+    
+    def __init__(self, index: Dict[str, Dict]):
+        """
+        역색인 생성
+        
+        Args:
+            index: 정규화된 이름 → 성분 정보 딕셔너리
+        """
+        self.keys = list(index)
+        self.items = list(index.values())
+        self.postings: Dict[str, Set[int]] = {}
+        self.short_positions: List[int] = []
+        for position, key in enumerate(self.keys):
+            grams = _trigrams(key)
+            if not grams:
+                self.short_positions.append(position)
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(position)
+    
+    def find(self, query: str) -> Optional[Dict]:
+        """
+        query를 포함하거나 query에 포함되는 이름 중 가장 앞선 성분을 반환합니다.
+        
+        Args:
+            query: 정규화된 검색어
+        
+        Returns:
+            성분 정보 딕셔너리, 없으면 None
+        """
+        grams = _trigrams(query)
+        if not grams:
+            # 3글자 미만 쿼리는 모든 이름이 후보 (드문 경우)
+            candidates = range(len(self.keys))
+        else:
+            candidates = set(self.short_positions)
+            candidates.update(*(self.postings.get(gram, ()) for gram in grams))
+        
+        best = None
+        for position in candidates:
+            if best is not None and position >= best:
+                continue
+            key = self.keys[position]
+            if query in key or key in query:
+                best = position
+        return self.items[best] if best is not None else None
+    
+    def find_fuzzy(self, query: str) -> Optional[Dict]:
+        """
+        오타/표기 차이를 허용하여 가장 비슷한 이름의 성분을 반환합니다 (`find_similar_name`).
+        
+        Args:
+            query: 정규화된 검색어
+        
+        Returns:
+            성분 정보 딕셔너리, 없으면 None
+        """
+        position = find_similar_name(query, self.keys)
+        return self.items[position] if position is not None else None
+
+
+class _IngredientCache:
+    """
+    성분 이름 인덱스 캐시
+    
+    이름/피부 타입 매칭에는 id/이름/피부 타입 컬럼만 필요하므로 전체 테이블은 `INDEX_COLUMNS`만 받아 인덱싱하고,
+    전체 컬럼 행은 실제로 매칭된 성분만 id로 조회(hydrate)하여 `full_rows`에 보관합니다.
+    
+    Args:
+        rows: 인덱스 컬럼만 가진 전체 성분 행 리스트
+    """
+    
+    def __init__(self, rows: List[Dict]):
+        """
+        이름 인덱스와 3-gram 역색인 생성
+        
+        Args:
+            rows: 인덱스 컬럼만 가진 전체 성분 행 리스트
+        """
+        self.loaded_at = time.monotonic()
+        self.rows = rows
+        # 정규화 이름은 적재 시 한 번만 계산하여 행에 보관 (인덱스/역색인이 같은 문자열 공유)
+        for item in rows:
+            item['_kor_norm'] = normalize_name(item['kor_name']) if item.get('kor_name') else None
+            item['_eng_norm'] = normalize_name(item['eng_name']) if item.get('eng_name') else None
+        self.kor_index = {item['_kor_norm']: item for item in rows if item['_kor_norm'] is not None}
+        self.eng_index = {item['_eng_norm']: item for item in rows if item['_eng_norm'] is not None}
+        self.kor_trigrams = _TrigramIndex(self.kor_index)
+        self.eng_trigrams = _TrigramIndex(self.eng_index)
+        # (good_for/bad_for, 피부 타입) → 성분 id 리스트 (id 순)
+        self.ids_by_skin_type: Dict[Tuple[str, str], List[Any]] = {}
+        for item in rows:
+            for field in SKIN_TYPE_FIELDS:
+                for skin_type in item.get(field) or ():
+                    self.ids_by_skin_type.setdefault((field, skin_type), []).append(item["id"])
+        # id → 읽기 전용 전체 컬럼 행 (매칭된 성분만 지연 조회)
+        self.full_rows: Dict[Any, Mapping] = {}
+    
+    def is_fresh(self) -> bool:
+        """캐시 유효 시간이 지나지 않았는지 확인"""
+        return time.monotonic() - self.loaded_at < INGREDIENTS_CACHE_TTL_SECONDS
+    
+    def match_exact(self, normalized: str) -> Optional[Dict]:
+        """
+        정규화된 이름을 한국어/영어 이름 인덱스에서 정확히 매칭합니다.
+        
+        Args:
+            normalized: 정규화된 성분명
+        
+        Returns:
+            인덱스 컬럼만 가진 성분 행, 없으면 None
+        """
+        item = self.kor_index.get(normalized)
+        if item is None:
+            item = self.eng_index.get(normalized)
+        return item
+    
+    def match_partial(self, normalized: str) -> Optional[Dict]:
+        """
+        정확히 일치하지 않은 이름을 부분 매칭하고, 없으면 유사 이름으로 매칭합니다.
+        
+        Args:
+            normalized: 정규화된 성분명
+        
+        Returns:
+            인덱스 컬럼만 가진 성분 행, 없으면 None
+        """
+        # 부분 매칭 시도 (3-gram 후보만 검사)
+        item = self.kor_trigrams.find(normalized)
+        if item is None:
+            item = self.eng_trigrams.find(normalized)
+        if item is None:
+            # 유사 이름 매칭 (오타/표기 차이, 최후의 수단)
+            item = self.kor_trigrams.find_fuzzy(normalized)
+            if item is None:
+                item = self.eng_trigrams.find_fuzzy(normalized)
+        return item
+    
+    def hydrate(self, client: Client, ids: List[Any]) -> Dict[Any, Mapping]:
+        """
+        id 목록의 전체 컬럼 행을 반환합니다 (아직 조회하지 않은 id만 IN 쿼리로 조회).
+        
+        Args:
+            client: Supabase 클라이언트
+            ids: 성분 id 리스트
+        
+        Returns:
+            id → 읽기 전용 전체 컬럼 행 딕셔너리
+        """
+        missing = [row_id for row_id in dict.fromkeys(ids) if row_id not in self.full_rows]
+        for start in range(0, len(missing), IN_QUERY_CHUNK_SIZE):
+            result = client.table("ingredients") \
+                .select("*") \
+                .in_("id", missing[start:start + IN_QUERY_CHUNK_SIZE]) \
+                .execute()
+            for row in result.data or []:
+                self.full_rows[row["id"]] = _freeze(row)
+        return {row_id: self.full_rows[row_id] for row_id in ids if row_id in self.full_rows}
+    
+    def resolve(self, client: Client, names: List[str]) -> Dict[str, Mapping]:
+        """
+        성분명 목록을 매칭한 뒤 매칭된 성분만 전체 컬럼으로 조회합니다.
+        
+        정확 매칭을 모든 이름에 먼저 수행하고, 부분/유사 매칭은 남은 이름에만 수행합니다.
+        
+        Args:
+            client: Supabase 클라이언트
+            names: 검색할 성분명 리스트
+        
+        Returns:
+            성분명 → 성분 정보 딕셔너리 매핑
+        """
+        # 1차: 모든 이름을 O(1) 정확 매칭, 2차: 남은 이름만 부분/유사 매칭
+        matched = {}
+        pending = []
+        for name in names:
+            normalized = normalize_name(name)
+            item = self.match_exact(normalized)
+            if item is not None:
+                matched[name] = item["id"]
+            else:
+                pending.append((name, normalized))
+        
+        for name, normalized in pending:
+            item = self.match_partial(normalized)
+            if item is not None:
+                matched[name] = item["id"]
+        
+        full_rows = self.hydrate(client, list(matched.values()))
+        return {name: full_rows[row_id] for name, row_id in matched.items() if row_id in full_rows}
+
+
+def _get_fresh_cache() -> Optional[_IngredientCache]:
+    """유효 시간 내의 성분 캐시를 반환합니다 (없거나 만료되면 None)."""
+    cache = _ingredients_cache
+    if cache is not None and cache.is_fresh():
+        return cache
+    return None
+
+
+def _get_indices() -> Optional[_IngredientCache]:
+    """
+    성분 이름 인덱스 캐시를 반환합니다.
+    
+    캐시가 없거나 만료되었으면 전체 테이블의 인덱스 컬럼(INDEX_COLUMNS)만 다시 조회하여 캐시를 채웁니다.
+    여러 스레드가 동시에 만료를 감지해도 Lock으로 조회는 한 번만 수행됩니다.
+    
+    Returns:
+        _IngredientCache 인스턴스, 조회 실패 시 None
+    """
+    global _ingredients_cache
+    
+    cache = _get_fresh_cache()
+    if cache is not None:
+        return cache
+    
+    with _ingredients_cache_lock:
+        cache = _get_fresh_cache()
+        if cache is not None:
+            return cache
+        
+        try:
+            rows = list(iter_all_ingredients(columns=INDEX_COLUMNS))
+        except Exception:
+            # 일부 페이지만 받은 인덱스는 캐시하지 않음 (오류는 iter_all_ingredients에서 기록)
+            return None
+        if not rows:
+            # 조회 실패/빈 테이블은 캐시하지 않고 다음 호출에서 다시 시도
+            return None
+        
+        _ingredients_cache = _IngredientCache(rows)
+        logger.info(f"🗃️ 성분 캐시 적재: {len(rows)}개")
+        return _ingredients_cache
+
+
+def warm_ingredient_cache(rows: Optional[List[Dict]] = None) -> bool:
+    """
+    성분 이름 인덱스 캐시를 미리 적재합니다 (서버 시작 시 호출).
+    
+    첫 요청이 전체 테이블 조회 지연을 떠안지 않도록 트래픽을 받기 전에 캐시를 채웁니다.
+    이미 전체 테이블을 조회한 경우(DataLoader) 그 행으로 인덱스를 만들고 전체 컬럼 행도
+    `full_rows`에 보관하여 테이블을 다시 조회하지 않습니다. 행이 없으면 `_get_indices()`로 조회합니다.
+    동시에 들어온 요청과 겹쳐도 같은 Lock을 사용하므로 적재는 한 번만 수행됩니다.
+    
+    Args:
+        rows: 이미 조회한 전체 컬럼 성분 행 리스트 (선택)
+    
+    Returns:
+        캐시 적재 성공 여부 (실패해도 첫 조회 시 다시 시도)
+    """
+    global _ingredients_cache
+    
+    try:
+        if rows is None:
+            return _get_indices() is not None
+        if not rows:
+            return False
+        
+        index_columns = INDEX_COLUMNS.split(",")
+        with _ingredients_cache_lock:
+            cache = _IngredientCache([
+                {column: item.get(column) for column in index_columns} for item in rows
+            ])
+            cache.full_rows.update((item["id"], _freeze(item)) for item in rows)
+            _ingredients_cache = cache
+        logger.info(f"🗃️ 성분 캐시 적재: {len(rows)}개 (로드된 행 재사용)")
+        return True
+    except Exception as e:
+        logger.error(f"❌ 성분 캐시 예열 오류: {e}", exc_info=True)
+        return False
+
+
+def invalidate_ingredients_cache():
+    """성분 캐시를 비웁니다 (성분 테이블 변경 시 호출)."""
+    global _ingredients_cache
+    
+    with _ingredients_cache_lock:
+        _ingredients_cache = None
+    _lookup_cache.clear()
+
+
+def get_ingredients_by_exact_names(names: List[str]) -> Dict[str, Dict]:
+    """
+    여러 성분명을 데이터베이스에서 정확히 일치하는 이름으로 일괄 조회
+    
+    이름 100개 단위로 `kor_name IN (...) OR eng_name IN (...)` 쿼리 한 번씩만 호출하고,
+    받은 행은 정규화된 이름(대소문자/공백 무시)으로 원래 검색어에 매핑합니다.
     
     Args:
         names: 검색할 성분명 리스트
     
     Returns:
-        성분명 → 성분 정보 딕셔너리 매핑
+        성분명 → 성분 정보 딕셔너리 매핑 (일치하지 않은 이름은 제외)
     
     Raises:
         Exception: 데이터베이스 오류 발생 시 (빈 딕셔너리 반환)
     """
     client = get_supabase_client()
     if not client:
-        logger.warning("Supabase 클라이언트가 없습니다.")
         return {}
     
-    result_map = {}
-    
     try:
-        # 모든 성분 한 번에 조회 (네트워크 호출 최소화)
-        all_ingredients = client.table("ingredients") \
-            .select("*") \
-            .execute()
+        stripped = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+        rows = []
+        for start in range(0, len(stripped), IN_QUERY_CHUNK_SIZE):
+            values = ",".join(_quote_filter_value(name) for name in stripped[start:start + IN_QUERY_CHUNK_SIZE])
+            result = client.table("ingredients") \
+                .select("*") \
+                .or_(f"kor_name.in.({values}),eng_name.in.({values})") \
+                .execute()
+            rows.extend(result.data or [])
         
-        if not all_ingredients.data:
-            logger.warning("성분 데이터가 비어있습니다.")
-            return {}
-        
-        # 이름으로 인덱싱 (O(n) 한 번만 수행)
-        kor_index = {item['kor_name'].lower().replace(" ", ""): item 
-                     for item in all_ingredients.data if item.get('kor_name')}
-        eng_index = {item['eng_name'].lower().replace(" ", ""): item 
-                     for item in all_ingredients.data if item.get('eng_name')}
-        
-        # 각 이름에 대해 매칭 (O(1) 검색)
+        kor_index, eng_index = _index_by_name(rows)
+        result_map = {}
         for name in names:
-            normalized = name.strip().lower().replace(" ", "")
-            
-            if normalized in kor_index:
-                result_map[name] = kor_index[normalized]
-            elif normalized in eng_index:
-                result_map[name] = eng_index[normalized]
-            else:
-                # 부분 매칭 시도 (O(n), 최후의 수단)
-                for kor_name, item in kor_index.items():
-                    if normalized in kor_name or kor_name in normalized:
-                        result_map[name] = item
-                        break
-                else:
-                    for eng_name, item in eng_index.items():
-                        if normalized in eng_name or eng_name in normalized:
-                            result_map[name] = item
-                            break
-        
+            normalized = normalize_name(name)
+            item = kor_index.get(normalized) or eng_index.get(normalized)
+            if item is not None:
+                result_map[name] = item
         return result_map
     except Exception as e:
-        logger.error(f"❌ 일괄 검색 오류 (names: {names}): {e}", exc_info=True)
+        logger.error(f"❌ 정확한 이름 일괄 조회 오류 (names: {names}): {e}", exc_info=True)
         return {}
 
 
-def get_all_ingredients() -> List[Dict]:
-    """모든 성분 조회"""
+def get_ingredients_by_names(names: List[str]) -> Dict[str, Mapping]:
+    """
+    여러 성분명으로 일괄 검색 (성능 최적화)
+    
+    효율성 개선:
+    - 캐시가 없으면 먼저 get_ingredients_by_exact_names로 정확한 이름만 IN 쿼리로 조회
+    - 전체 테이블은 정확히 일치하지 않은 이름이 있을 때만 조회 (대소문자/공백 차이, 부분 매칭)
+    - 이름 인덱스는 인덱스 컬럼만 받아 프로세스 내에 캐시하고, 매칭된 성분만 전체 컬럼을 조회
+    - 중복된 이름은 한 번만 조회
+    
+    Args:
+        names: 검색할 성분명 리스트
+    
+    Returns:
+        성분명 → 성분 정보 매핑 (캐시에 보관된 행은 읽기 전용 MappingProxyType)
+    
+    Raises:
+        Exception: 데이터베이스 오류 발생 시 (빈 딕셔너리 반환)
+    """
     client = get_supabase_client()
     if not client:
-        return []
+        logger.warning("Supabase 클라이언트가 없습니다.")
+        return {}
     
     try:
-        result = client.table("ingredients") \
-            .select("*") \
-            .execute()
-        
-        return result.data if result.data else []
+        # 성분 목록에 반복되는 이름은 한 번만 조회한 뒤 원래 이름으로 다시 매핑
+        unique_names = list(dict.fromkeys(name.strip() for name in names))
+        unique_map = _resolve_unique_names(client, unique_names)
+        return {name: unique_map[name.strip()] for name in names if name.strip() in unique_map}
     except Exception as e:
-        logger.error(f"❌ 전체 성분 조회 오류: {e}", exc_info=True)
+        logger.error(f"❌ 일괄 검색 오류 (names: {names}): {e}", exc_info=True)
+        return {}
+
+
+def _resolve_unique_names(client: Client, names: List[str]) -> Dict[str, Mapping]:
+    """
+    중복 없는 성분명 목록을 성분 정보로 매핑합니다.
+    
+    Args:
+        client: Supabase 클라이언트
+        names: 앞뒤 공백을 제거한 중복 없는 성분명 리스트
+    
+    Returns:
+        성분명 → 성분 정보 딕셔너리 매핑
+    """
+    cache = _get_fresh_cache()
+    if cache is not None:
+        return cache.resolve(client, names)
+    
+    # 1. 정확한 이름 일괄 조회 (청크당 한 번의 IN 쿼리)
+    result_map = get_ingredients_by_exact_names(names)
+    pending = [name for name in names if name not in result_map]
+    
+    if not pending:
+        return {name: _freeze(item) for name, item in result_map.items()}
+    
+    # 2. 남은 이름만 전체 성분(캐시)에서 정규화 매칭 및 부분 매칭
+    cache = _get_indices()
+    
+    if cache is None:
+        logger.warning("성분 데이터가 비어있습니다.")
+        return result_map
+    
+    # 정확히 일치한 행은 이미 전체 컬럼이므로 재조회하지 않도록 캐시에 보관
+    result_map = {
+        name: cache.full_rows.setdefault(item["id"], _freeze(item))
+        for name, item in result_map.items()
+    }
+    result_map.update(cache.resolve(client, pending))
+    return result_map
+
+
+def _rest_client_kwargs() -> Dict[str, Any]:
+    """PostgREST 직접 호출용 httpx 클라이언트 설정 (기본 URL, 인증 헤더, 타임아웃)"""
+    return {
+        "base_url": f"{SUPABASE_URL.rstrip('/')}/rest/v1",
+        "headers": {"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+        "timeout": REST_REQUEST_TIMEOUT_SECONDS
+    }
+
+
+def _get_rest_client() -> httpx.Client:
+    """PostgREST 직접 호출용 httpx 동기 클라이언트 싱글톤 반환 (연결 재사용)"""
+    global _rest_client
+    
+    if _rest_client is None:
+        with _rest_client_lock:
+            if _rest_client is None:
+                _rest_client = httpx.Client(**_rest_client_kwargs())
+    
+    return _rest_client
+
+
+def _fetch_ingredients_page(start: int, page_size: int, columns: str) -> List[Dict]:
+    """
+    id 순으로 [start, start + page_size) 범위의 성분 한 페이지 조회
+    
+    전체 테이블 조회는 응답 JSON 파싱 비용이 크므로 PostgREST에 직접 요청하고 orjson으로 파싱합니다.
+    """
+    response = _get_rest_client().get(
+        "/ingredients",
+        params={"select": columns, "order": "id", "offset": start, "limit": page_size}
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def iter_all_ingredients(page_size: int = PAGE_SIZE, columns: str = "*") -> Iterator[Dict]:
+    """
+    모든 성분을 한 행씩 조회하는 제너레이터
+    
+    한 번의 요청으로 전체 테이블을 받는 대신 offset/limit으로 페이지 단위로 나누어 받아
+    네트워크 응답 하나의 크기를 한 페이지로 제한하고, PostgREST 최대 행 수 제한에 걸리지 않도록 합니다.
+    호출자가 현재 페이지의 행을 처리하는 동안 다음 페이지를 백그라운드 스레드에서 미리 조회합니다.
+    
+    Args:
+        page_size: 페이지당 행 수
+        columns: 조회할 컬럼 (PostgREST select 문자열)
+    
+    Yields:
+        성분 딕셔너리
+    
+    Raises:
+        Exception: 페이지 조회 실패 시 (호출자가 일부만 받은 테이블을 전체로 사용하지 않도록 전파)
+    """
+    if not get_supabase_client():
+        return
+    
+    start = 0
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_fetch_ingredients_page, start, page_size, columns)
+        while True:
+            try:
+                page = future.result()
+            except Exception as e:
+                logger.error(f"❌ 성분 페이지 조회 오류 (start: {start}): {e}", exc_info=True)
+                raise
+            
+            if len(page) < page_size:
+                yield from page
+                return
+            
+            # 다음 페이지를 미리 요청한 뒤 현재 페이지 반환 (네트워크와 처리 시간 중첩)
+            start += page_size
+            future = executor.submit(_fetch_ingredients_page, start, page_size, columns)
+            yield from page
+
+
+def get_all_ingredients() -> List[Dict]:
+    """모든 성분 조회 (페이지 단위 조회 결과를 하나의 리스트로 반환, 일부 페이지라도 실패하면 빈 리스트)"""
+    try:
+        return list(iter_all_ingredients())
+    except Exception:
         return []
 
 
@@ -196,48 +725,76 @@ def get_ingredients_count() -> int:
     if not client:
         return 0
     
+    cache = _get_fresh_cache()
+    if cache is not None:
+        return len(cache.rows)
+    
     try:
+        # HEAD 요청으로 행 없이 개수(Content-Range)만 받음
         result = client.table("ingredients") \
-            .select("id", count="exact") \
+            .select("id", count="exact", head=True) \
             .execute()
         
-        return result.count if hasattr(result, 'count') else len(result.data)
+        return result.count or 0
     except Exception as e:
         logger.error(f"❌ 성분 개수 조회 오류: {e}", exc_info=True)
         return 0
 
 
-def get_good_ingredients_for_skin_type(skin_type: str) -> List[Dict]:
-    """특정 피부 타입에 좋은 성분 조회"""
+def _get_ingredients_for_skin_type(field: str, skin_type: str) -> List[Mapping]:
+    """
+    good_for/bad_for 배열에 피부 타입이 포함된 성분 조회
+    
+    결과는 (필드, 피부 타입)별로 TTL 캐시되며, 행은 읽기 전용 매핑으로 복사 없이 반환합니다.
+    해당 성분 id는 성분 인덱스 캐시의 피부 타입 인덱스에서 찾고, 인덱스를 만들 수 없을 때만
+    `contains` 쿼리로 조회합니다.
+    
+    Args:
+        field: "good_for" 또는 "bad_for"
+        skin_type: 피부 타입 키워드
+    
+    Returns:
+        성분 정보 딕셔너리 리스트
+    
+    Raises:
+        Exception: 데이터베이스 오류 발생 시 (호출자에서 처리)
+    """
     client = get_supabase_client()
     if not client:
         return []
     
+    cache_key = (field, skin_type)
+    rows = _lookup_cache.get(cache_key)
+    if rows is None:
+        cache = _get_indices()
+        if cache is not None:
+            ids = cache.ids_by_skin_type.get(cache_key, [])
+            full_rows = cache.hydrate(client, ids)
+            rows = tuple(full_rows[row_id] for row_id in ids if row_id in full_rows)
+        else:
+            result = client.table("ingredients") \
+                .select("*") \
+                .contains(field, [skin_type]) \
+                .execute()
+            rows = tuple(_freeze(item) for item in result.data or ())
+        _lookup_cache.set(cache_key, rows)
+    
+    return list(rows)
+
+
+def get_good_ingredients_for_skin_type(skin_type: str) -> List[Mapping]:
+    """특정 피부 타입에 좋은 성분 조회 (TTL 캐시)"""
     try:
-        result = client.table("ingredients") \
-            .select("*") \
-            .contains("good_for", [skin_type]) \
-            .execute()
-        
-        return result.data if result.data else []
+        return _get_ingredients_for_skin_type("good_for", skin_type)
     except Exception as e:
         logger.error(f"❌ 피부 타입별 좋은 성분 조회 오류: {e}", exc_info=True)
         return []
 
 
-def get_bad_ingredients_for_skin_type(skin_type: str) -> List[Dict]:
-    """특정 피부 타입에 나쁜 성분 조회"""
-    client = get_supabase_client()
-    if not client:
-        return []
-    
+def get_bad_ingredients_for_skin_type(skin_type: str) -> List[Mapping]:
+    """특정 피부 타입에 나쁜 성분 조회 (TTL 캐시)"""
     try:
-        result = client.table("ingredients") \
-            .select("*") \
-            .contains("bad_for", [skin_type]) \
-            .execute()
-        
-        return result.data if result.data else []
+        return _get_ingredients_for_skin_type("bad_for", skin_type)
     except Exception as e:
         logger.error(f"❌ 피부 타입별 나쁜 성분 조회 오류: {e}", exc_info=True)
         return []